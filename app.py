@@ -1,23 +1,148 @@
 import streamlit as st
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
 import logging
+import socket
+from typing import Callable, Dict, Optional
+from config.settings import Settings
 from core.crawling import YouTubeCrawler
-from core.preprocessing import TextPreprocessor
+from core.preprocessing import PreprocessCache, TextPreprocessor
 from core.modeling import SentimentClassifier
+from core.pipeline import SentimentPipeline
+from core.instrumentation import metrics
+from core.jobs import ACTIVE_STATUSES, APP_WORKER_SUFFIX, CANCELLED, DONE, FAILED, RUNNING, JobExecutor, JobQueue, execute_job
 from database.connection import DatabaseManager
 
 # Konfigurasi logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Jumlah baris prediksi yang ditampilkan di halaman hasil analisis
+PREVIEW_ROWS = 100
+
+@st.cache_resource
+def get_components():
+    # Komponen dibuat sekali per proses dan dipakai ulang di setiap rerun Streamlit
+    db_manager = DatabaseManager()
+    result_cache = PreprocessCache(db_manager) if Settings.PREPROCESS_RESULT_CACHE else None
+    return YouTubeCrawler(), TextPreprocessor(result_cache=result_cache), SentimentClassifier(), db_manager
+
+@st.cache_resource
+def get_job_executor():
+    # Job latar belakang hidup selama proses Streamlit, tidak ikut berhenti saat rerun
+    crawler, preprocessor, _, db_manager = get_components()
+
+    def run_job(kind, payload, progress_callback):
+        # Model sendiri per job agar job yang berjalan bersamaan tidak saling menimpa. Crawler
+        # dipakai bersama (klien API per thread) sehingga semua job berbagi satu rate limiter.
+        pipeline = SentimentPipeline(db_manager, preprocessor, SentimentClassifier(), crawler=crawler)
+        return execute_job(pipeline, kind, payload, progress_callback)
+
+    return JobExecutor(JobQueue(db_manager, worker_id=f"{socket.gethostname()}{APP_WORKER_SUFFIX}"), run_job)
+
+@st.fragment(run_every=Settings.JOB_REFRESH_INTERVAL)
+def job_progress(executor: JobExecutor, job_id: int, text: str):
+    """
+    Progress job yang diperbarui berkala tanpa menjalankan ulang seluruh halaman
+    """
+    job = executor.queue.get(job_id)
+    if job is None or job['status'] not in ACTIVE_STATUSES:
+        # Job selesai: jalankan ulang halaman untuk menampilkan hasilnya
+        st.rerun()
+
+    progress, total = int(job['progress']), int(job['total'])
+    if job['status'] != RUNNING:
+        st.progress(0.0, text=f"{text} (menunggu giliran)")
+    elif total:
+        st.progress(min(progress / total, 1.0), text=f"{text} {progress}/{total}")
+    else:
+        st.progress(0.0, text=f"{text} {progress}")
+
+    if st.button("Batalkan", key=f"cancel_job_{job_id}"):
+        executor.cancel(job_id)
+        st.rerun()
+
+def job_panel(executor: JobExecutor, kind: str, video_id: Optional[str], start_label: str,
+              progress_text: str, can_start: bool = True,
+              success_message: Optional[Callable[[Dict], str]] = None) -> Optional[Dict]:
+    """
+    Tombol untuk menjalankan job di latar belakang beserta progress-nya. Job yang
+    masih berjalan ditampilkan kembali setelah rerun atau dari sesi lain, bukan
+    dimulai ulang. Hasil job ditampilkan sekali di sesi yang memulainya.
+    """
+    job = executor.queue.latest(kind, video_id)
+    if job is not None and job['status'] in ACTIVE_STATUSES:
+        job_progress(executor, int(job['id']), progress_text)
+        return job
+
+    started_jobs = st.session_state.setdefault('started_jobs', set())
+    if job is not None and int(job['id']) in started_jobs:
+        started_jobs.discard(int(job['id']))
+        if job['status'] == DONE:
+            st.success(success_message(job['result'] or {}) if success_message else "Selesai!")
+        elif job['status'] == FAILED:
+            st.error(f"Job gagal: {job['error']}")
+        elif job['status'] == CANCELLED:
+            st.warning("Job dibatalkan. Data yang sudah diproses tetap tersimpan dan dilanjutkan saat dijalankan lagi.")
+
+    if can_start and st.button(start_label, key=f"start_{kind}_{video_id}"):
+        started_jobs.add(executor.submit(kind, {'video_ids': [video_id]} if video_id else {}))
+        st.rerun()
+    return job
+
+def paginated_table(db_manager, state_key: str, table: str, columns, key: str = 'id',
+                    equals=None, contains=None):
+    """
+    Tabel dengan paginasi keyset di sisi database; hanya satu halaman yang diambil.
+    Cursor tiap halaman disimpan di session_state dan di-reset saat filter berubah.
+    """
+    filters = (repr(equals), repr(contains))
+    state = st.session_state.setdefault(state_key, {'filters': filters, 'cursors': [None]})
+    if state['filters'] != filters:
+        state.update(filters=filters, cursors=[None])
+
+    total = db_manager.count_rows(table, equals=equals, contains=contains, ttl=Settings.QUERY_CACHE_TTL)
+    page = db_manager.fetch_page(
+        table, columns, key=key, after=state['cursors'][-1],
+        equals=equals, contains=contains, ttl=Settings.QUERY_CACHE_TTL
+    )
+    page_number = len(state['cursors'])
+    page_count = max(1, -(-total // Settings.PAGE_SIZE))
+
+    st.dataframe(page, hide_index=True)
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    with col_info:
+        st.caption(f"Halaman {page_number} dari {page_count} ({total} baris)")
+    with col_prev:
+        if st.button("Sebelumnya", key=f"{state_key}_prev", disabled=page_number == 1):
+            state['cursors'].pop()
+            st.rerun()
+    with col_next:
+        has_next = len(page) == Settings.PAGE_SIZE and page_number < page_count
+        if st.button("Berikutnya", key=f"{state_key}_next", disabled=not has_next):
+            last_key = page[key].iloc[-1]
+            state['cursors'].append(last_key.item() if hasattr(last_key, 'item') else last_key)
+            st.rerun()
+    return total
+
+def sentiment_filters(state_key: str, column: str = 'sentiment', text_column: str = 'comment'):
+    """
+    Input filter sentimen dan pencarian teks, dikembalikan sebagai (equals, contains)
+    """
+    col_sentiment, col_search = st.columns([1, 2])
+    with col_sentiment:
+        sentiment = st.selectbox("Sentimen", ["Semua", "positif", "negatif", "netral"], key=f"{state_key}_sentiment")
+    with col_search:
+        search = st.text_input("Cari teks", key=f"{state_key}_search")
+    equals = {column: sentiment} if sentiment != "Semua" else {}
+    contains = {text_column: search.strip()} if search.strip() else {}
+    return equals, contains
+
 def main():
     # Inisialisasi komponen
-    crawler = YouTubeCrawler()
-    preprocessor = TextPreprocessor()
-    classifier = SentimentClassifier()
-    db_manager = DatabaseManager()
+    crawler, preprocessor, classifier, db_manager = get_components()
+    pipeline = SentimentPipeline(db_manager, preprocessor, classifier, crawler=crawler)
+    job_queue = JobQueue(db_manager)
+    job_executor = get_job_executor()
 
     # Sidebar
     st.sidebar.title("Sentiment Analysis App")
@@ -32,52 +157,27 @@ def main():
         
         if video_id:
             try:
-                # Dapatkan detail video
-                video_details = crawler.get_video_details(video_id)
-                print(video_details)
-                
-                if video_details:
-                    title, thumbnail_url = video_details
-                    
-                    # Simpan video ke database
-                    insert_query = """
-                        INSERT INTO youtube_video (video_id, title, thumbnail_url)
-                        VALUES (%s, %s, %s)
-                        ON DUPLICATE KEY UPDATE title=%s, thumbnail_url=%s
-                    """
-                    params = (video_id, title, thumbnail_url, title, thumbnail_url)
-                    print(params)
-
-                    db_manager.execute_query(insert_query, params)
-
-                    
-                    # Ambil komentar
-                    comments = crawler.get_comments(video_id)
-                    
-                    if comments:
-                        # Simpan komentar ke database
-                        insert_comments_query = """
-                            INSERT INTO youtube_comments (video_id, comment, sender) 
-                            VALUES (%s, %s, %s)
-                        """
-                        for comment, sender in comments:
-                            params = (video_id, comment, sender)
-                            db_manager.execute_query(insert_comments_query, params)
-
-                        
-                        st.success("Data video dan komentar berhasil disimpan ke database!")
-                        
-                        # Menampilkan data video dan komentar yang disimpan dalam bentuk tabel
-                        st.subheader("Hasil Crawling Comments")
-                        data_crawled = db_manager.fetch_data("""
-                            SELECT * FROM youtube_comments 
-                            WHERE video_id = %s
-                        """, (video_id,))
-                        st.dataframe(data_crawled)
-                    else:
-                        st.warning("Tidak ada komentar yang ditemukan.")
-                else:
-                    st.error("Tidak dapat menemukan informasi video.")
+                # Simpan detail video dan komentar baru sejak crawling terakhir. Crawling
+                # berjalan di latar belakang, jadi rerun (mis. pindah halaman tabel) tidak
+                # mengulanginya dan komentar yang sudah masuk langsung bisa dilihat
+                job = job_panel(
+                    job_executor, 'crawl', video_id, "Mulai Crawling", "Crawling komentar...",
+                    success_message=lambda result: (
+                        f"Data video dan {(result.get(video_id) or {}).get('new_comments', 0)} "
+                        f"komentar baru berhasil disimpan ke database!"
+                    )
+                )
+
+                if db_manager.count_rows('youtube_comments', equals={'video_id': video_id}) > 0:
+                    # Menampilkan komentar yang disimpan per halaman
+                    st.subheader("Hasil Crawling Comments")
+                    paginated_table(
+                        db_manager, 'crawl_comments', 'youtube_comments',
+                        ['comment_id', 'comment', 'sender', 'published_at', 'sentiment'],
+                        key='comment_id', equals={'video_id': video_id}
+                    )
+                elif job is not None and job['status'] == DONE:
+                    st.warning("Tidak ada komentar yang ditemukan.")
             
             except Exception as e:
                 st.error(f"Terjadi kesalahan: {e}")
@@ -88,14 +188,21 @@ def main():
         st.title("Data Training")
 
         uploaded_file = st.file_uploader("Upload CSV untuk menambahkan Data Training", type="csv")
-        if uploaded_file:
+        # Skrip dijalankan ulang di setiap interaksi; file yang sama hanya disimpan sekali
+        saved_uploads = st.session_state.setdefault('saved_training_uploads', set())
+        if uploaded_file and uploaded_file.file_id in saved_uploads:
+            st.success("Data Training berhasil ditambahkan!")
+        elif uploaded_file:
             try:
                 data = pd.read_csv(uploaded_file)
                 
                 # Simpan data training ke database
                 insert_query = "INSERT INTO training (comment, sentiment) VALUES (%s, %s)"
-                for _, row in data.iterrows():
-                    db_manager.execute_query(insert_query, (row['comment'], row['sentiment']))
+                db_manager.execute_many(
+                    insert_query,
+                    data[['comment', 'sentiment']].itertuples(index=False, name=None)
+                )
+                saved_uploads.add(uploaded_file.file_id)
                 
                 st.success("Data Training berhasil ditambahkan!")
 
@@ -103,60 +210,75 @@ def main():
                 st.error(f"Kesalahan saat mengunggah data: {e}")
                 logger.error(f"Training data upload error: {e}")
 
-        # Tampilkan data training
-        data_train = db_manager.fetch_data("SELECT * FROM training")
-        st.dataframe(data_train)
+        # Tampilkan data training per halaman dengan filter di sisi database
+        equals, contains = sentiment_filters('training')
+        paginated_table(
+            db_manager, 'training_table', 'training', ['id', 'comment', 'sentiment'],
+            equals=equals, contains=contains
+        )
 
         st.title("Preprocessing Data Training")
         
-        # Cek data preprocessed
-        data_preprocessed = db_manager.fetch_data("SELECT * FROM preprocessed_training")
+        # Preprocessing hanya data training baru (di atas watermark), di latar belakang
+        new_training_rows = pipeline.count_new_training()
+        if new_training_rows > 0:
+            st.info(f"{new_training_rows} data training baru belum dipreprocessing.")
+        job_panel(
+            job_executor, 'preprocess', None, "Mulai Preprocessing", "Preprocessing data training...",
+            can_start=new_training_rows > 0,
+            success_message=lambda result: f"Preprocessing selesai! {result.get('processed', 0)} data baru ditambahkan."
+        )
         
-        if not data_preprocessed.empty:
-            st.dataframe(data_preprocessed)
-        else:
-            if st.button("Mulai Preprocessing"):
+        # Cek data preprocessed
+        if db_manager.count_rows('preprocessed_training', ttl=Settings.QUERY_CACHE_TTL) > 0:
+            equals, contains = sentiment_filters('preprocessed', text_column='text')
+            paginated_table(
+                db_manager, 'preprocessed_table', 'preprocessed_training', ['id', 'sentiment', 'text'],
+                equals=equals, contains=contains
+            )
+
+            # Evaluasi model (k-fold + grid search), terpisah dari pelatihan
+            st.subheader("Evaluasi Model")
+            if st.button("Mulai Evaluasi"):
                 try:
-                    # Ambil data training mentah
-                    raw_data = db_manager.fetch_data("SELECT * FROM training")
-                    
-                    # Preprocessing
-                    preprocessed_data = preprocessor.preprocess_texts(raw_data['comment'])
-                    preprocessed_df = pd.DataFrame({
-                        "text": preprocessed_data,
-                        "sentiment": raw_data["sentiment"]
-                    })
-                    
-                    # Simpan data preprocessed
-                    insert_preprocessed_query = "INSERT INTO preprocessed_training (text, sentiment) VALUES (%s, %s)"
-                    for _, row in preprocessed_df.iterrows():
-                        db_manager.execute_query(insert_preprocessed_query, (row['text'], row['sentiment']))
-                    
-                    st.success("Preprocessing selesai!")
-                    st.dataframe(preprocessed_df)
-                
+                    # Seluruh data hanya dimuat saat evaluasi dijalankan
+                    data_preprocessed = db_manager.fetch_data(
+                        "SELECT text, sentiment FROM preprocessed_training ORDER BY id"
+                    )
+                    evaluation = classifier.evaluate(
+                        data_preprocessed['text'],
+                        data_preprocessed['sentiment'],
+                        cv=5,
+                        n_jobs=-1,
+                        param_grid={
+                            'n_neighbors': [1, 3, 5, 7, 9],
+                            'metric': ['euclidean', 'cosine'],
+                            'weights': ['uniform', 'distance']
+                        }
+                    )
+                    st.write(f"**Parameter terbaik**: {evaluation['best_params']} "
+                             f"(akurasi {evaluation['best_score']:.2%})")
+                    st.dataframe(pd.DataFrame(evaluation['results']).drop(columns=['scores']))
+
                 except Exception as e:
-                    st.error(f"Kesalahan preprocessing: {e}")
-                    logger.error(f"Preprocessing error: {e}")
+                    st.error(f"Kesalahan evaluasi: {e}")
+                    logger.error(f"Evaluation error: {e}")
 
     # Menu: Data Test
     elif menu == "Data Test":
         st.title("Data Test")
 
         # Ambil video yang tersedia
-        data_video = db_manager.fetch_data("SELECT * FROM youtube_video")
+        data_video = db_manager.fetch_data("SELECT * FROM youtube_video", ttl=Settings.QUERY_CACHE_TTL)
         video_ids = data_video["video_id"].unique()
         selected_video_id = st.selectbox("Pilih Video", video_ids)
 
         if selected_video_id:
             try:
-                # Ambil komentar
-                comments_data = db_manager.fetch_data("""
-                    SELECT vc.comment_id, vc.sentiment, vc.comment, vc.sender, vc.video_id
-                    FROM youtube_comments vc
-                    JOIN youtube_video v ON vc.video_id = v.video_id
-                    WHERE vc.video_id = %s
-                """, (selected_video_id,))
+                # Jumlah komentar (isi komentar diambil per halaman)
+                video_filter = {'video_id': selected_video_id}
+                comment_count = db_manager.count_rows('youtube_comments', equals=video_filter,
+                                                      ttl=Settings.QUERY_CACHE_TTL)
                 
                 # Detail video
                 selected_video_data = data_video[data_video["video_id"] == selected_video_id].iloc[0]
@@ -167,12 +289,21 @@ def main():
                 st.write(f"**Title**: {title}")
                 st.image(thumbnail_url, width=300)
 
-                if not comments_data.empty:
-                    st.subheader(f"Comments ({len(comments_data)})")
-                    st.dataframe(comments_data.drop(columns=["video_id"]))
+                if comment_count > 0:
+                    st.subheader(f"Comments ({comment_count})")
+                    equals, contains = sentiment_filters('test_comments')
+                    paginated_table(
+                        db_manager, 'test_comments_table', 'youtube_comments',
+                        ['comment_id', 'sentiment', 'comment', 'sender'],
+                        key='comment_id', equals={**video_filter, **equals}, contains=contains
+                    )
 
                     # Cek apakah kolom sentimen sudah terisi
-                    if comments_data["sentiment"].isnull().any():
+                    unlabelled = db_manager.count_rows(
+                        'youtube_comments', equals={**video_filter, 'sentiment': None},
+                        ttl=Settings.QUERY_CACHE_TTL
+                    )
+                    if unlabelled > 0:
                         st.warning("Klasifikasi sentimen secara manual belum diisi.")
                         
                         # Opsi unggah CSV untuk update sentimen
@@ -184,14 +315,10 @@ def main():
                                 
                                 # Validasi kolom
                                 if "sentiment" in uploaded_data.columns and "comment_id" in uploaded_data.columns:
-                                    # Update sentimen manual
-                                    update_query = """
-                                        UPDATE youtube_comments 
-                                        SET sentiment = %s 
-                                        WHERE comment_id = %s
-                                    """
-                                    for _, row in uploaded_data.iterrows():
-                                        db_manager.execute_query(update_query, (row['sentiment'], row['comment_id']))
+                                    # Update sentimen manual (ringkasan prediksi ikut diperbarui)
+                                    pipeline.update_labels(
+                                        uploaded_data[['sentiment', 'comment_id']].itertuples(index=False, name=None)
+                                    )
                                     
                                     st.success("Sentimen berhasil diperbarui!")
                                 
@@ -202,30 +329,22 @@ def main():
                                 st.error(f"Kesalahan mengunggah file: {e}")
                                 logger.error(f"File upload error: {e}")
 
-                    data_preprocessed = db_manager.fetch_data("""
-                        SELECT text
-                        FROM preprocessed_test
-                        WHERE video_id = %s
-                    """, (selected_video_id,))
-
-                    if not data_preprocessed.empty:
+                    # Preprocessing per chunk di latar belakang; jika terputus atau
+                    # dibatalkan, dilanjutkan dari komentar yang belum diproses
+                    preprocessed_count = db_manager.count_rows('preprocessed_test', equals=video_filter,
+                                                               ttl=Settings.QUERY_CACHE_TTL)
+                    job_panel(
+                        job_executor, 'preprocess_test', selected_video_id,
+                        "Mulai Preprocessing" if preprocessed_count == 0 else "Lanjutkan Preprocessing",
+                        "Preprocessing komentar...", can_start=preprocessed_count < comment_count,
+                        success_message=lambda result: "Preprocessing selesai!"
+                    )
+                    if preprocessed_count > 0:
                         st.subheader("Preprocessed Comments")
-                        st.dataframe(data_preprocessed)
-                    else:
-                        if st.button("Mulai Preprocessing"):
-                            preprocessed_data = preprocessor.preprocess_texts(comments_data["comment"])
-                            preprocessed_df = pd.DataFrame({
-                                "text": preprocessed_data,
-                                "video_id": comments_data["video_id"]
-                            })
-
-                            insert_preprocessed_query = "INSERT INTO preprocessed_test (text, video_id) VALUES (%s, %s)"
-                            for _, row in preprocessed_df.iterrows():
-                                db_manager.execute_query(insert_preprocessed_query, (row['text'], row['video_id']))
-                            
-                            st.success("Preprocessing selesai!")
-                            st.subheader("Preprocessed Comments")
-                            st.dataframe(preprocessed_df)
+                        paginated_table(
+                            db_manager, 'preprocessed_test_table', 'preprocessed_test',
+                            ['id', 'text'], equals=video_filter
+                        )
 
             except Exception as e:
                 st.error(f"Terjadi kesalahan: {e}")
@@ -235,18 +354,32 @@ def main():
     elif menu == "Hasil Analisis Sentimen":
         st.title("Hasil Analisis Sentimen")
 
-        # Ambil video yang tersedia
-        data_video = db_manager.fetch_data("SELECT * FROM youtube_video")
+        # Ambil video yang tersedia (di-cache, dibersihkan otomatis setelah ada penulisan)
+        data_video = db_manager.fetch_data("SELECT * FROM youtube_video", ttl=Settings.QUERY_CACHE_TTL)
         video_ids = data_video["video_id"].unique()
+
+        # Laporan tingkat channel: semua video dipilih diprediksi dalam satu job batch
+        with st.expander("Analisis Banyak Video"):
+            batch_video_ids = st.multiselect("Pilih Video", video_ids, key="batch_video_ids")
+            col_app, col_worker = st.columns(2)
+            with col_app:
+                if st.button("Jalankan Batch", disabled=not batch_video_ids):
+                    job_id = job_executor.submit('predict', {'video_ids': list(batch_video_ids)})
+                    st.info(f"Job #{job_id} berjalan di latar belakang.")
+            with col_worker:
+                if st.button("Jalankan Batch di Worker", disabled=not batch_video_ids):
+                    job_id = job_queue.enqueue('predict', {'video_ids': list(batch_video_ids)})
+                    st.info(f"Job #{job_id} masuk antrian worker.")
+
         selected_video_id = st.selectbox("Pilih Video", video_ids)
 
         if selected_video_id:
             try:
-                # Ambil komentar
-                comments_data = db_manager.fetch_data("""
-                    SELECT * FROM youtube_comments 
+                # Hitung komentar (komentar sendiri diproses per chunk oleh pipeline)
+                comment_count = int(db_manager.fetch_data("""
+                    SELECT COUNT(*) AS total FROM youtube_comments 
                     WHERE video_id = %s
-                """, (selected_video_id,))
+                """, (selected_video_id,), ttl=Settings.QUERY_CACHE_TTL)['total'].iloc[0])
                 
                 # Detail video
                 selected_video_data = data_video[data_video["video_id"] == selected_video_id].iloc[0]
@@ -257,22 +390,41 @@ def main():
                 st.write(f"**Title**: {title}")
                 st.image(thumbnail_url, width=300)
 
-                if not comments_data.empty:
-                    # Cek apakah prediksi sudah ada
-                    predicted_data = db_manager.fetch_data("""
-                        SELECT c.sentiment, p.predict_sentiment, c.comment
-                        FROM predicted_sentiment p
-                        JOIN youtube_comments c ON p.comment_id = c.comment_id
-                        WHERE p.video_id = %s
-                    """, (selected_video_id,))
+                if comment_count > 0:
+                    # Ringkasan prediksi yang sudah diagregasi saat prediksi disimpan
+                    summary = pipeline.video_summary(selected_video_id)
+
+                    # Prediksi berjalan di latar belakang (komentar yang sudah diprediksi
+                    # dilewati); job yang sedang berjalan ditampilkan kembali setelah rerun
+                    job_panel(
+                        job_executor, 'predict', selected_video_id,
+                        "Analisis Sentiment" if summary['total'] == 0 else "Prediksi Komentar Baru",
+                        "Memproses komentar...", can_start=summary['total'] < comment_count,
+                        success_message=lambda result: "Analysis selesai!"
+                    )
                     
-                    if not predicted_data.empty:
+                    if summary['total'] > 0:
                         st.subheader("Predicted Sentiment")
+                        if summary['accuracy'] is not None:
+                            st.metric("Akurasi (komentar berlabel)", f"{summary['accuracy']:.2%}")
+                        predicted_data = db_manager.fetch_data("""
+                            SELECT c.sentiment, p.predict_sentiment, c.comment
+                            FROM predicted_sentiment p
+                            JOIN youtube_comments c ON p.comment_id = c.comment_id
+                            WHERE p.video_id = %s
+                            ORDER BY p.id
+                            LIMIT %s
+                        """, (selected_video_id, PREVIEW_ROWS), ttl=Settings.QUERY_CACHE_TTL)
+                        st.caption(f"Menampilkan {len(predicted_data)} dari {summary['total']} prediksi")
                         st.dataframe(predicted_data)
                         
+                        # Library plot cukup berat, di-import hanya saat grafik ditampilkan
+                        import seaborn as sns
+                        import matplotlib.pyplot as plt
+
                         # Pie Chart distribusi prediksi
                         st.subheader("Predicted Sentiment Distribution")
-                        sentiment_counts = predicted_data["predict_sentiment"].value_counts()
+                        sentiment_counts = summary['counts']
                         
                         labels = sentiment_counts.index
                         sizes = sentiment_counts.values
@@ -284,70 +436,64 @@ def main():
                         st.pyplot(fig)
 
                         # Confusion Matrix
-                        st.subheader("Confusion Matrix")
-                        cm = pd.crosstab(
-                            predicted_data["sentiment"], 
-                            predicted_data["predict_sentiment"]
-                        )
-                        plt.figure(figsize=(6, 5))
-                        sns.heatmap(cm, annot=True, fmt="d", cmap="Blues")
-                        plt.xlabel('Predicted Sentiment')
-                        plt.ylabel('True Sentiment')
-                        st.pyplot(plt)
+                        cm = summary['confusion']
+                        if not cm.empty:
+                            st.subheader("Confusion Matrix")
+                            plt.figure(figsize=(6, 5))
+                            sns.heatmap(cm, annot=True, fmt="d", cmap="Blues")
+                            plt.xlabel('Predicted Sentiment')
+                            plt.ylabel('True Sentiment')
+                            st.pyplot(plt)
 
                     else:
-                        # Tombol untuk melakukan analisis sentimen
-                        if st.button("Analisis Sentiment"):
-                            try:
-                                # Ambil data preprocessed
-                                preprocessed_data = preprocessor.preprocess_texts(comments_data['comment'])
-                                
-                                # Ambil data training yang sudah dipreprocess
-                                training_data = db_manager.fetch_data("SELECT * FROM preprocessed_training")
-                                
-                                # Latih model
-                                model_result = classifier.train(
-                                    training_data['text'], 
-                                    training_data['sentiment']
-                                )
-                                
-                                # Prediksi
-                                predictions = classifier.predict(preprocessed_data)
-                                
-                                # Simpan prediksi
-                                predicted_df = pd.DataFrame({
-                                    "sentiment": comments_data["sentiment"],
-                                    "predict_sentiment": predictions,
-                                    "comment": comments_data["comment"],
-                                    "comment_id": comments_data["comment_id"],
-                                    "video_id": comments_data["video_id"]
-                                })
-                                
-                                # Simpan ke database
-                                insert_prediction_query = """
-                                    INSERT INTO predicted_sentiment 
-                                    (predict_sentiment, comment_id, video_id) 
-                                    VALUES (%s, %s, %s)
-                                """
-                                for _, row in predicted_df.iterrows():
-                                    db_manager.execute_query(
-                                        insert_prediction_query, 
-                                        (row['predict_sentiment'], row['comment_id'], row['video_id'])
-                                    )
-                                
-                                st.success(f"Analysis selesai! Akurasi: {model_result['accuracy']:.2%}")
-                                st.subheader("Model Performance")
-                                st.json(model_result['report'])
-                            
-                            except Exception as e:
-                                st.error(f"Kesalahan analisis: {e}")
-                                logger.error(f"Sentiment analysis error: {e}")
+                        # Alternatif: serahkan ke worker terpisah (python cli.py worker)
+                        if st.button("Jalankan di Worker"):
+                            job_id = job_queue.enqueue('predict', {'video_ids': [selected_video_id]})
+                            st.info(f"Job #{job_id} masuk antrian worker.")
+
+                        video_jobs = [
+                            job for job in job_queue.recent()
+                            if job['kind'] == 'predict'
+                            and selected_video_id in (job['payload'] or {}).get('video_ids', [])
+                        ]
+                        if video_jobs:
+                            st.subheader("Status Job Worker")
+                            st.dataframe(pd.DataFrame(video_jobs)[
+                                ['id', 'status', 'progress', 'total', 'created_at', 'finished_at', 'error']
+                            ], hide_index=True)
+                            st.button("Refresh Status")
                 else:
                     st.write("Tidak ada data untuk video ini.")
 
             except Exception as e:
                 st.error(f"Terjadi kesalahan: {e}")
                 logger.error(f"Sentiment analysis error: {e}")
+    # Panel performa: durasi per tahap dari proses terakhir
+    if metrics.enabled:
+        with st.sidebar.expander("Performance"):
+            snapshot = metrics.snapshot()
+            if snapshot['stages']:
+                st.dataframe(pd.DataFrame([
+                    {
+                        'Tahap': stage,
+                        'Terakhir (s)': round(stats['last_seconds'], 3),
+                        'Baris': stats['last_rows'],
+                        'Jumlah': stats['count'],
+                        'Total (s)': round(stats['total_seconds'], 3)
+                    }
+                    for stage, stats in sorted(snapshot['stages'].items())
+                ]), hide_index=True)
+            else:
+                st.write("Belum ada data performa.")
+            if snapshot['counters'] or snapshot['gauges']:
+                st.json({**snapshot['counters'], **snapshot['gauges']})
+            st.download_button(
+                "Unduh metrics (Prometheus)",
+                metrics.to_prometheus(),
+                file_name="metrics.prom",
+                mime="text/plain"
+            )
+
     # Footer
     st.sidebar.markdown("---")
     st.sidebar.info("KNN Sentiment Analysis © 2024")
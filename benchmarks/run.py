@@ -0,0 +1,360 @@
+"""
+Benchmark hot path: preprocessing, vektorisasi/KNN dan penulisan database.
+
+Korpus diambil dari sentiment_analysis.sql (tabel training dan youtube_comments),
+diperbesar secara sintetis ke ukuran yang diminta, lalu setiap benchmark dijalankan
+dan hasilnya ditulis sebagai JSON agar bisa dibandingkan antar commit.
+
+    python -m benchmarks.run --sizes 10000 100000 --output bench.json
+    python -m benchmarks.run --sizes 10000 --only preprocess_texts --compare bench.json
+"""
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import platform
+import tempfile
+import subprocess
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.preprocessing import CLEAN_PATTERNS, TextPreprocessor
+from core.resources import get_slang_dict, get_slang_trie
+from core.modeling import SentimentClassifier
+from database.connection import DatabaseManager
+
+SQL_DUMP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sentiment_analysis.sql')
+
+INSERT_PATTERN = re.compile(r"^INSERT INTO `(\w+)` VALUES \((.*)\);$")
+SQL_ESCAPES = {'n': '\n', 'r': '\r', 't': '\t', '0': '\0', 'Z': '\x1a'}
+
+# Batas jumlah baris untuk benchmark insert satu-per-satu (baseline lama)
+ROW_BY_ROW_LIMIT = 2000
+
+
+def parse_values(values: str) -> List[Optional[str]]:
+    """Parse isi VALUES (...) dump MySQL menjadi list nilai (string/None)."""
+    items, i = [], 0
+    while i < len(values):
+        char = values[i]
+        if char in ' ,':
+            i += 1
+        elif char == "'":
+            chars, i = [], i + 1
+            while i < len(values):
+                char = values[i]
+                if char == '\\' and i + 1 < len(values):
+                    chars.append(SQL_ESCAPES.get(values[i + 1], values[i + 1]))
+                    i += 2
+                elif char == "'" and values[i + 1:i + 2] == "'":
+                    chars.append("'")
+                    i += 2
+                elif char == "'":
+                    i += 1
+                    break
+                else:
+                    chars.append(char)
+                    i += 1
+            items.append(''.join(chars))
+        else:
+            end = values.find(',', i)
+            end = len(values) if end == -1 else end
+            token = values[i:end].strip()
+            items.append(None if token == 'NULL' else token)
+            i = end
+    return items
+
+
+def load_corpus(path: str = SQL_DUMP) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Baris training (comment, sentiment) dan youtube_comments (comment) dari dump SQL."""
+    training, comments = [], []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            match = INSERT_PATTERN.match(line.rstrip('\n'))
+            if not match:
+                continue
+            table, values = match.groups()
+            row = parse_values(values)
+            if table == 'training':
+                training.append((row[1], row[2]))
+            elif table == 'youtube_comments':
+                comments.append((row[2],))
+    return (
+        pd.DataFrame(training, columns=['comment', 'sentiment']),
+        pd.DataFrame(comments, columns=['comment'])
+    )
+
+
+def scale_texts(texts: pd.Series, size: int, seed: int = 42) -> pd.Series:
+    """
+    Perbesar korpus ke `size` komentar: setiap komentar sintetis adalah komentar asli
+    acak, separuhnya digabung dengan potongan kata dari komentar lain agar tidak
+    semuanya duplikat persis (kosakata tetap kecil dan berulang seperti data asli).
+    """
+    rng = np.random.default_rng(seed)
+    base = texts.fillna('').tolist()
+    words = [text.split() for text in base]
+    picks = rng.integers(0, len(base), size)
+    extras = rng.integers(0, len(base), size)
+    mix = rng.random(size) < 0.5
+
+    scaled = []
+    for pick, extra, mixed in zip(picks, extras, mix):
+        text = base[pick]
+        if mixed and words[extra]:
+            cut = int(rng.integers(1, len(words[extra]) + 1))
+            text = f"{text} {' '.join(words[extra][:cut])}"
+        scaled.append(text)
+    return pd.Series(scaled)
+
+
+def scale_labelled(training: pd.DataFrame, size: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(training), size)
+    return pd.DataFrame({
+        'comment': scale_texts(training['comment'].iloc[picks].reset_index(drop=True), size, seed),
+        'sentiment': training['sentiment'].iloc[picks].to_numpy()
+    })
+
+
+class Context:
+    """Data dan objek yang dipakai bersama oleh benchmark untuk satu ukuran."""
+
+    def __init__(self, size: int, training: pd.DataFrame, comments: pd.DataFrame, n_jobs: int):
+        self.size = size
+        self.n_jobs = n_jobs
+        self.texts = scale_texts(comments['comment'], size)
+        self.labelled = scale_labelled(training, size)
+        self.preprocessor = TextPreprocessor(stem_cache_path=None)
+        self._preprocessed_labelled = None
+        self._preprocessed_texts = None
+        self._classifier = None
+        self._word_lists = None
+
+    @property
+    def preprocessed_labelled(self) -> pd.Series:
+        if self._preprocessed_labelled is None:
+            self._preprocessed_labelled = pd.Series(
+                self.preprocessor.preprocess_texts(self.labelled['comment'], n_jobs=self.n_jobs)
+            )
+        return self._preprocessed_labelled
+
+    @property
+    def preprocessed_texts(self) -> pd.Series:
+        if self._preprocessed_texts is None:
+            self._preprocessed_texts = pd.Series(
+                self.preprocessor.preprocess_texts(self.texts, n_jobs=self.n_jobs)
+            )
+        return self._preprocessed_texts
+
+    @property
+    def word_lists(self) -> List[List[str]]:
+        """Kata-kata setiap komentar setelah pembersihan regex (input normalisasi slang)."""
+        if self._word_lists is None:
+            cleaned = self.texts.str.lower()
+            for pattern in CLEAN_PATTERNS:
+                cleaned = cleaned.str.replace(pattern, '', regex=True)
+            self._word_lists = cleaned.str.split().tolist()
+        return self._word_lists
+
+    @property
+    def classifier(self) -> SentimentClassifier:
+        if self._classifier is None:
+            self._classifier = SentimentClassifier()
+            self._classifier.train(self.preprocessed_labelled, self.labelled['sentiment'])
+        return self._classifier
+
+
+def bench_clean_text(ctx: Context) -> int:
+    preprocessor = TextPreprocessor(stem_cache_path=None)
+    for text in ctx.texts:
+        preprocessor.clean_text(text)
+    return len(ctx.texts)
+
+
+def bench_preprocess_texts(ctx: Context) -> int:
+    preprocessor = TextPreprocessor(stem_cache_path=None)
+    preprocessor.preprocess_texts(ctx.texts, n_jobs=ctx.n_jobs)
+    return len(ctx.texts)
+
+
+def bench_slang_dict(ctx: Context) -> int:
+    # Jalur lama: lookup dict per kata, frasa beberapa kata tidak dikenali
+    slang_dict = get_slang_dict()
+    for words in ctx.word_lists:
+        [slang_dict.get(word, word) for word in words]
+    return len(ctx.word_lists)
+
+
+def bench_slang_trie(ctx: Context) -> int:
+    normalize = get_slang_trie().normalize
+    for words in ctx.word_lists:
+        normalize(words)
+    return len(ctx.word_lists)
+
+
+def bench_train(ctx: Context) -> int:
+    SentimentClassifier().train(ctx.preprocessed_labelled, ctx.labelled['sentiment'])
+    return len(ctx.labelled)
+
+
+def bench_predict(ctx: Context) -> int:
+    ctx.classifier.predict(ctx.preprocessed_texts)
+    return len(ctx.texts)
+
+
+def _sqlite_manager(path: str) -> DatabaseManager:
+    db_manager = DatabaseManager(
+        connection_factory=lambda: sqlite3.connect(path, check_same_thread=False),
+        driver=sqlite3
+    )
+    db_manager.execute_query("DROP TABLE IF EXISTS youtube_comments")
+    db_manager.execute_query("""
+        CREATE TABLE youtube_comments (
+            comment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            video_id TEXT, comment TEXT, sender TEXT
+        )
+    """)
+    return db_manager
+
+
+def bench_db_execute_many(ctx: Context) -> int:
+    with tempfile.TemporaryDirectory() as directory:
+        db_manager = _sqlite_manager(os.path.join(directory, 'bench.db'))
+        rows = [('video', text, 'sender') for text in ctx.texts]
+        db_manager.execute_many(
+            "INSERT INTO youtube_comments (video_id, comment, sender) VALUES (?, ?, ?)", rows
+        )
+        db_manager.pool.close_all()
+    return len(rows)
+
+
+def bench_db_execute_query(ctx: Context) -> int:
+    # Baseline: satu statement + commit per baris, dibatasi ROW_BY_ROW_LIMIT baris
+    with tempfile.TemporaryDirectory() as directory:
+        db_manager = _sqlite_manager(os.path.join(directory, 'bench.db'))
+        texts = ctx.texts[:ROW_BY_ROW_LIMIT]
+        for text in texts:
+            db_manager.execute_query(
+                "INSERT INTO youtube_comments (video_id, comment, sender) VALUES (?, ?, ?)",
+                ('video', text, 'sender')
+            )
+        db_manager.pool.close_all()
+    return len(texts)
+
+
+BENCHMARKS: Dict[str, Callable[[Context], int]] = {
+    'clean_text': bench_clean_text,
+    'preprocess_texts': bench_preprocess_texts,
+    'slang_dict': bench_slang_dict,
+    'slang_trie': bench_slang_trie,
+    'train': bench_train,
+    'predict': bench_predict,
+    'db_execute_many': bench_db_execute_many,
+    'db_execute_query': bench_db_execute_query,
+}
+
+# Persiapan di luar pengukuran waktu (preprocessing input, model terlatih)
+SETUP: Dict[str, Callable[[Context], object]] = {
+    'slang_dict': lambda ctx: (get_slang_dict(), ctx.word_lists),
+    'slang_trie': lambda ctx: (get_slang_trie(), ctx.word_lists),
+    'train': lambda ctx: ctx.preprocessed_labelled,
+    'predict': lambda ctx: (ctx.classifier, ctx.preprocessed_texts),
+}
+
+
+def run_benchmark(name: str, ctx: Context, repeat: int) -> Dict:
+    if name in SETUP:
+        SETUP[name](ctx)
+
+    timings, rows = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = BENCHMARKS[name](ctx)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {
+        'benchmark': name,
+        'size': ctx.size,
+        'rows': rows,
+        'seconds': best,
+        'rows_per_second': rows / best if best else None,
+        'timings': timings
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def compare(results: List[Dict], baseline_path: str):
+    """Cetak rasio waktu terhadap hasil benchmark sebelumnya (>1 berarti lebih lambat)."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {
+            (r['benchmark'], r['size']): r for r in json.load(f)['results']
+        }
+    print(f"\nDibandingkan dengan {baseline_path}:")
+    for result in results:
+        previous = baseline.get((result['benchmark'], result['size']))
+        if previous and previous['seconds']:
+            ratio = result['seconds'] / previous['seconds']
+            print(f"  {result['benchmark']:<20} {result['size']:>9}  x{ratio:.2f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000],
+                        help="ukuran korpus sintetis (mis. 10000 100000 1000000)")
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help="jalankan benchmark tertentu saja")
+    parser.add_argument('--repeat', type=int, default=1, help="ulangi setiap benchmark, ambil waktu tercepat")
+    parser.add_argument('--jobs', type=int, default=1, help="n_jobs untuk preprocess_texts")
+    parser.add_argument('--output', help="tulis hasil JSON ke file ini (default: stdout)")
+    parser.add_argument('--compare', help="file JSON hasil sebelumnya untuk dibandingkan")
+    args = parser.parse_args(argv)
+
+    training, comments = load_corpus()
+    names = args.only or list(BENCHMARKS)
+    results = []
+    for size in args.sizes:
+        ctx = Context(size, training, comments, args.jobs)
+        for name in names:
+            result = run_benchmark(name, ctx, args.repeat)
+            results.append(result)
+            print(f"{name:<20} {size:>9} rows  {result['seconds']:9.3f}s  "
+                  f"{result['rows_per_second'] or 0:12.0f} rows/s", file=sys.stderr)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'corpus': {'training': len(training), 'youtube_comments': len(comments)},
+            'jobs': args.jobs
+        },
+        'results': results
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
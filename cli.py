@@ -0,0 +1,160 @@
+"""
+Entry point tanpa Streamlit untuk crawling, preprocessing, training dan prediksi.
+
+    python cli.py crawl --video-id VIDEO1 VIDEO2 --jobs 4
+    python cli.py preprocess
+    python cli.py preprocess_test --video-id VIDEO1
+    python cli.py train
+    python cli.py predict --video-id VIDEO1 VIDEO2 --jobs 4
+    python cli.py enqueue predict --video-id VIDEO1
+    python cli.py worker
+    python cli.py serve --workers 4
+    python cli.py loadtest --requests 2000 --concurrency 32
+
+Perintah ``worker`` memproses antrian di tabel jobs sehingga UI cukup enqueue dan
+polling status. Perintah ``serve`` menjalankan layanan prediksi HTTP dengan
+micro-batching; ``loadtest`` mengukur latensi p50/p99 dan throughput-nya.
+"""
+import sys
+import json
+import time
+import logging
+import argparse
+from typing import List, Optional
+from config.settings import Settings
+from core.preprocessing import TextPreprocessor
+from core.pipeline import SentimentPipeline
+from core.jobs import (
+    JOB_KINDS, JobCancelled, JobQueue, build_pipeline, execute_job, failed_videos, run_job
+)
+from core import serving
+
+logger = logging.getLogger('cli')
+
+
+def run_worker(pipeline: SentimentPipeline, queue: JobQueue, poll_interval: float,
+               once: bool = False, jobs: int = 1, stale_timeout: float = Settings.JOB_STALE_TIMEOUT):
+    """
+    Mengambil job dari antrian dan menjalankannya sampai dihentikan (Ctrl+C).
+    Dengan once=True worker berhenti saat antrian kosong. Saat start, job 'running'
+    yang ditinggal worker mati (tanpa progress selama stale_timeout) ditandai gagal.
+    """
+    logger.info(f"Worker {queue.worker_id} started")
+    stale = queue.fail_stale(stale_timeout, "Worker berhenti sebelum job selesai")
+    if stale:
+        logger.warning(f"Marked {stale} stale job(s) as failed")
+    while True:
+        job = queue.claim()
+        if job is None:
+            if once:
+                return
+            time.sleep(poll_interval)
+            continue
+
+        job_id = int(job['id'])
+        logger.info(f"Running job {job_id} ({job['kind']})")
+
+        try:
+            result = execute_job(pipeline, job['kind'], job['payload'] or {},
+                                 queue.progress_callback(job_id), jobs)
+            queue.complete(job_id, result)
+        except JobCancelled:
+            logger.info(f"Job {job_id} cancelled")
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            queue.fail(job_id, str(e))
+
+
+def run_server(pipeline: SentimentPipeline, args: argparse.Namespace):
+    """
+    Memuat model terakhir dari MODEL_DIR (tanpa database); jika belum ada, model
+    dilatih dari data training terlebih dahulu
+    """
+    if pipeline.classifier.load_latest(Settings.MODEL_DIR) is None:
+        pipeline.load_or_train_model()
+
+    # Cache hasil preprocessing di database tidak dipakai agar jalur request tidak
+    # bergantung pada round trip ke MySQL
+    serving.serve(
+        pipeline.classifier, TextPreprocessor(), host=args.host, port=args.port,
+        workers=args.workers, max_batch_size=args.max_batch, max_wait_ms=args.max_wait_ms
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name in ('crawl', 'preprocess_test', 'predict'):
+        subparser = subparsers.add_parser(name)
+        subparser.add_argument('--video-id', dest='video_ids', nargs='+', required=True)
+        subparser.add_argument('--jobs', type=int, default=1,
+                               help="jumlah proses paralel (crawl) atau thread KNN (predict)")
+    subparsers.add_parser('preprocess')
+    subparsers.add_parser('train')
+
+    enqueue_parser = subparsers.add_parser('enqueue', help="tambahkan job ke antrian worker")
+    enqueue_parser.add_argument('kind', choices=JOB_KINDS)
+    enqueue_parser.add_argument('--video-id', dest='video_ids', nargs='+', default=[])
+
+    worker_parser = subparsers.add_parser('worker', help="proses antrian job")
+    worker_parser.add_argument('--poll-interval', type=float, default=Settings.WORKER_POLL_INTERVAL)
+    worker_parser.add_argument('--once', action='store_true', help="berhenti saat antrian kosong")
+    worker_parser.add_argument('--jobs', type=int, default=1, help="jumlah proses paralel per job")
+
+    serve_parser = subparsers.add_parser('serve', help="layanan prediksi HTTP")
+    serve_parser.add_argument('--host', default=Settings.SERVE_HOST)
+    serve_parser.add_argument('--port', type=int, default=Settings.SERVE_PORT)
+    serve_parser.add_argument('--workers', type=int, default=Settings.SERVE_WORKERS, help="jumlah proses worker")
+    serve_parser.add_argument('--max-batch', type=int, default=Settings.SERVE_MAX_BATCH)
+    serve_parser.add_argument('--max-wait-ms', type=float, default=Settings.SERVE_MAX_WAIT_MS)
+
+    loadtest_parser = subparsers.add_parser('loadtest', help="uji beban layanan prediksi")
+    loadtest_parser.add_argument('--url', default=f"http://{Settings.SERVE_HOST}:{Settings.SERVE_PORT}")
+    loadtest_parser.add_argument('--file', help="file teks, satu komentar per baris")
+    loadtest_parser.add_argument('--requests', type=int, default=1000)
+    loadtest_parser.add_argument('--concurrency', type=int, default=16)
+    loadtest_parser.add_argument('--batch-size', type=int, default=1, help="jumlah teks per request")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == 'loadtest':
+        if args.file:
+            with open(args.file, encoding='utf-8') as f:
+                texts = [line.strip() for line in f if line.strip()]
+        else:
+            texts = list(serving.SAMPLE_TEXTS)
+        result = serving.load_test(args.url, texts, args.requests, args.concurrency, args.batch_size)
+        print(json.dumps(result, indent=2))
+        return 0
+
+    pipeline = build_pipeline()
+
+    if args.command == 'serve':
+        try:
+            run_server(pipeline, args)
+        except KeyboardInterrupt:
+            logger.info("Server stopped")
+        return 0
+
+    if args.command == 'enqueue':
+        job_id = JobQueue(pipeline.db_manager).enqueue(args.kind, {'video_ids': args.video_ids})
+        print(job_id)
+        return 0
+
+    if args.command == 'worker':
+        try:
+            run_worker(pipeline, JobQueue(pipeline.db_manager), args.poll_interval, args.once, args.jobs)
+        except KeyboardInterrupt:
+            logger.info("Worker stopped")
+        return 0
+
+    payload = {'video_ids': getattr(args, 'video_ids', [])}
+    result = run_job(pipeline, args.command, payload, jobs=getattr(args, 'jobs', 1))
+    print(json.dumps(result, indent=2, default=str))
+    return 1 if failed_videos(args.command, result) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,7 +5,85 @@ load_dotenv()
 
 class Settings:
     YOUTUBE_API_KEY = os.getenv('YOUTUBE_API_KEY')
+    YOUTUBE_REQUESTS_PER_SECOND = float(os.getenv('YOUTUBE_REQUESTS_PER_SECOND', '5'))
+    YOUTUBE_MAX_RETRIES = int(os.getenv('YOUTUBE_MAX_RETRIES', '5'))
+    # Checkpoint crawling (page token, komentar terbaru) per video
+    CRAWL_STATE_DIR = os.getenv('CRAWL_STATE_DIR', '.crawl_state')
+
     DB_HOST = os.getenv('DB_HOST', 'localhost')
     DB_USER = os.getenv('DB_USER', 'root')
     DB_PASSWORD = os.getenv('DB_PASSWORD', '')
-    DB_NAME = os.getenv('DB_NAME', 'sentiment_analysis')
\ No newline at end of file
+    DB_NAME = os.getenv('DB_NAME', 'sentiment_analysis')
+    # Jumlah baris per executemany pada penulisan bulk
+    DB_CHUNK_SIZE = int(os.getenv('DB_CHUNK_SIZE', '1000'))
+
+    # Connection pool
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+    # Koneksi idle lebih lama dari ini (detik) dicek dulu sebelum dipakai ulang
+    DB_POOL_PING_INTERVAL = float(os.getenv('DB_POOL_PING_INTERVAL', '30'))
+    DB_MAX_RETRIES = int(os.getenv('DB_MAX_RETRIES', '1'))
+
+    # Direktori artefak model (vectorizer + KNN) yang sudah dilatih
+    MODEL_DIR = os.getenv('MODEL_DIR', 'models')
+    # Backend tetangga terdekat: sklearn, cosine (exact) atau lsh (approximate)
+    KNN_BACKEND = os.getenv('KNN_BACKEND', 'sklearn')
+    # Pemangkasan kosakata TF-IDF dan reduksi dimensi SVD (0 = nonaktif)
+    TFIDF_MAX_FEATURES = int(os.getenv('TFIDF_MAX_FEATURES', '0')) or None
+    TFIDF_MIN_DF = int(os.getenv('TFIDF_MIN_DF', '1'))
+    SVD_COMPONENTS = int(os.getenv('SVD_COMPONENTS', '0')) or None
+    # Vectorizer: tfidf atau hashing (bisa ditambah data tanpa rebuild kosakata)
+    VECTORIZER = os.getenv('VECTORIZER', 'tfidf')
+    # Rebuild penuh jika data tambahan inkremental melebihi proporsi ini
+    MODEL_REBUILD_RATIO = float(os.getenv('MODEL_REBUILD_RATIO', '0.2'))
+    # Matriks training artefak di-memory-map (dibagi antar proses) alih-alih disalin ke RAM
+    MODEL_MMAP = os.getenv('MODEL_MMAP', 'true').lower() in ('1', 'true', 'yes')
+
+    # Cache stemming Sastrawi per kata
+    STEM_CACHE_SIZE = int(os.getenv('STEM_CACHE_SIZE', '100000'))
+    STEM_CACHE_PATH = os.getenv('STEM_CACHE_PATH') or None
+
+    # Jumlah komentar per chunk pada pipeline analisis sentimen
+    PIPELINE_CHUNK_SIZE = int(os.getenv('PIPELINE_CHUNK_SIZE', '1000'))
+    # Jumlah thread pencarian KNN saat prediksi banyak video sekaligus (-1 = semua core)
+    PREDICT_JOBS = int(os.getenv('PREDICT_JOBS', '-1'))
+    # Jumlah komentar yang divektorisasi dan diprediksi sekaligus oleh predict_videos
+    PREDICT_BATCH_SIZE = int(os.getenv('PREDICT_BATCH_SIZE', '10000'))
+
+    # Jumlah proses untuk preprocessing (-1 = semua core)
+    PREPROCESS_JOBS = int(os.getenv('PREPROCESS_JOBS', '1'))
+    # Simpan hasil preprocessing per teks di tabel preprocess_cache
+    PREPROCESS_RESULT_CACHE = os.getenv('PREPROCESS_RESULT_CACHE', 'true').lower() in ('1', 'true', 'yes')
+
+    # Instrumentasi waktu per tahap (panel Performance, metrik Prometheus)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    METRICS_LOG = os.getenv('METRICS_LOG', 'false').lower() in ('1', 'true', 'yes')
+
+    # Interval polling antrian job oleh worker CLI (detik)
+    WORKER_POLL_INTERVAL = float(os.getenv('WORKER_POLL_INTERVAL', '5'))
+    # Job 'running' tanpa update progress selama ini (detik) dianggap ditinggal worker
+    # yang mati dan ditandai gagal saat worker start; harus lebih lama dari training
+    JOB_STALE_TIMEOUT = float(os.getenv('JOB_STALE_TIMEOUT', '3600'))
+    # Job latar belakang di dalam aplikasi Streamlit: jumlah job bersamaan dan
+    # interval refresh progress di halaman (detik)
+    JOB_EXECUTOR_WORKERS = int(os.getenv('JOB_EXECUTOR_WORKERS', '2'))
+    JOB_REFRESH_INTERVAL = float(os.getenv('JOB_REFRESH_INTERVAL', '1'))
+
+    # Hasil kompilasi stopwords, kamus slang dan kata dasar (kosong = nonaktif)
+    RESOURCE_CACHE_PATH = os.getenv('RESOURCE_CACHE_PATH', '.cache/resources.pkl')
+
+    # Cache hasil query dashboard (detik; 0 = nonaktif) dan jumlah query maksimum
+    QUERY_CACHE_TTL = float(os.getenv('QUERY_CACHE_TTL', '60'))
+    QUERY_CACHE_SIZE = int(os.getenv('QUERY_CACHE_SIZE', '256'))
+
+    # Jumlah baris per halaman tabel di UI
+    PAGE_SIZE = int(os.getenv('PAGE_SIZE', '50'))
+
+    # Layanan prediksi HTTP (python cli.py serve): alamat, jumlah proses worker,
+    # ukuran micro-batch maksimum, waktu tunggu pengumpulan batch dan timeout request
+    SERVE_HOST = os.getenv('SERVE_HOST', '127.0.0.1')
+    SERVE_PORT = int(os.getenv('SERVE_PORT', '8000'))
+    SERVE_WORKERS = int(os.getenv('SERVE_WORKERS', '1'))
+    SERVE_MAX_BATCH = int(os.getenv('SERVE_MAX_BATCH', '256'))
+    SERVE_MAX_WAIT_MS = float(os.getenv('SERVE_MAX_WAIT_MS', '5'))
+    SERVE_TIMEOUT = float(os.getenv('SERVE_TIMEOUT', '30'))
\ No newline at end of file
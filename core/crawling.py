@@ -1,17 +1,138 @@
-from googleapiclient.discovery import build
-from typing import List, Tuple, Optional
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Optional
+import os
+import json
+import time
+import random
+import socket
+import threading
 import logging
 from config.settings import Settings
+from core.instrumentation import metrics
+
+# Status HTTP dari YouTube API yang layak dicoba ulang
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+RATE_LIMIT_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded')
+
+
+class RateLimiter:
+    """
+    Token bucket untuk request YouTube API, dipakai bersama oleh semua thread yang
+    memakai crawler yang sama (mis. semua job crawling di aplikasi)
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class CrawlState:
+    """
+    Checkpoint crawling per video (page token, komentar terbaru yang sudah dilihat)
+    yang disimpan sebagai file JSON
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _path(self, video_id: str) -> str:
+        return os.path.join(self.directory, f"{video_id}.json")
+
+    def load(self, video_id: str) -> Dict:
+        try:
+            with open(self._path(video_id), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def save(self, video_id: str, state: Dict):
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(video_id)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, path)
+
+
+def _build_youtube_client():
+    # googleapiclient lambat di-import, jadi hanya dimuat saat klien dibutuhkan
+    from googleapiclient.discovery import build
+
+    return build("youtube", "v3", developerKey=Settings.YOUTUBE_API_KEY)
+
 
 class YouTubeCrawler:
-    def __init__(self):
-        self.youtube = build("youtube", "v3", developerKey=Settings.YOUTUBE_API_KEY)
+    def __init__(self, client_factory: Optional[Callable[[], Any]] = None,
+                 state_dir: str = Settings.CRAWL_STATE_DIR,
+                 requests_per_second: float = Settings.YOUTUBE_REQUESTS_PER_SECOND,
+                 max_retries: int = Settings.YOUTUBE_MAX_RETRIES,
+                 backoff_base: float = 1.0):
+        # Klien API tidak thread-safe, jadi setiap thread membuat kliennya sendiri
+        self._client_factory = client_factory or _build_youtube_client
+        self._local = threading.local()
+        self.state = CrawlState(state_dir)
+        self.rate_limiter = RateLimiter(requests_per_second, burst=max(1, int(requests_per_second)))
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
         self.logger = logging.getLogger(__name__)
 
+    @property
+    def youtube(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self._client_factory()
+        return client
+
+    def _is_retryable(self, error: Exception) -> bool:
+        from googleapiclient.errors import HttpError
+
+        if isinstance(error, HttpError):
+            status = error.resp.status
+            if status == 403:
+                return any(reason in str(error.content) for reason in RATE_LIMIT_REASONS)
+            return status in RETRYABLE_STATUSES
+        return isinstance(error, (socket.timeout, ConnectionError))
+
+    def _execute(self, request) -> Dict:
+        """
+        Menjalankan request API melalui rate limiter, dengan retry exponential backoff
+        untuk error sementara (rate limit, 5xx, timeout)
+        """
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                with metrics.timer('youtube.request'):
+                    return request.execute()
+            except Exception as e:
+                metrics.count('youtube.request_errors')
+                if attempt == self.max_retries or not self._is_retryable(e):
+                    raise
+                delay = self.backoff_base * (2 ** attempt) + random.uniform(0, self.backoff_base)
+                self.logger.warning(f"YouTube API error ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
     def get_video_details(self, video_id: str) -> Optional[Tuple[str, str]]:
         try:
             request = self.youtube.videos().list(part="snippet", id=video_id)
-            response = request.execute()
+            response = self._execute(request)
             
             if not response["items"]:
                 self.logger.warning(f"No video found for ID: {video_id}")
@@ -26,29 +147,87 @@ class YouTubeCrawler:
             self.logger.error(f"Error fetching video details: {e}")
             return None
 
-    def get_comments(self, video_id: str, max_comments: int = 100) -> List[Tuple[str, str]]:
-        comments = []
-        try:
-            request = self.youtube.commentThreads().list(
-                part="snippet", 
-                videoId=video_id, 
-                maxResults=min(max_comments, 100)
-            )
+    @staticmethod
+    def _to_comment(video_id: str, comment: Dict, parent_id: Optional[str] = None) -> Dict:
+        snippet = comment["snippet"]
+        return {
+            'comment_id': comment["id"],
+            'parent_id': parent_id,
+            'video_id': video_id,
+            'comment': snippet["textDisplay"],
+            'sender': snippet["authorDisplayName"],
+            'published_at': snippet["publishedAt"]
+        }
+
+    def _thread_replies(self, video_id: str, thread: Dict) -> List[Dict]:
+        parent_id = thread["snippet"]["topLevelComment"]["id"]
+        included = thread.get("replies", {}).get("comments", [])
+
+        # commentThreads hanya menyertakan sebagian balasan; sisanya lewat comments().list
+        if thread["snippet"].get("totalReplyCount", 0) <= len(included):
+            return [self._to_comment(video_id, reply, parent_id) for reply in included]
 
-            while request and len(comments) < max_comments:
-                response = request.execute()
-                for item in response["items"]:
-                    comment_snippet = item["snippet"]["topLevelComment"]["snippet"]
-                    comments.append((
-                        comment_snippet["textDisplay"], 
-                        comment_snippet["authorDisplayName"]
-                    ))
-                
-                request = self.youtube.commentThreads().list_next(request, response)
-                if not request:
+        replies = []
+        page_token = None
+        while True:
+            params = {'part': "snippet", 'parentId': parent_id, 'maxResults': 100}
+            if page_token:
+                params['pageToken'] = page_token
+            response = self._execute(self.youtube.comments().list(**params))
+            replies.extend(self._to_comment(video_id, reply, parent_id) for reply in response.get("items", []))
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return replies
+
+    def iter_comment_pages(self, video_id: str, max_comments: Optional[int] = None,
+                           include_replies: bool = True, incremental: bool = True) -> Iterator[List[Dict]]:
+        """
+        Menghasilkan komentar (beserta comment ID YouTube) per halaman API.
+
+        Page token disimpan sebagai checkpoint setelah pemanggil selesai memproses
+        sebuah halaman, sehingga crawling yang terputus dilanjutkan dari halaman
+        pertama yang belum diproses. Dengan ``incremental`` crawling berhenti di
+        thread yang lebih lama dari komentar terbaru pada crawling terakhir yang
+        selesai (balasan baru di thread lama tidak ikut diambil).
+        """
+        state = self.state.load(video_id)
+        since = state.get('newest_published_at') if incremental else None
+        page_token = state.get('page_token')
+        newest = state.get('pending_newest') or since or ''
+        total = 0
+
+        while True:
+            params = {'part': "snippet,replies", 'videoId': video_id, 'maxResults': 100, 'order': "time"}
+            if page_token:
+                params['pageToken'] = page_token
+            response = self._execute(self.youtube.commentThreads().list(**params))
+
+            comments = []
+            reached_known = False
+            for item in response.get("items", []):
+                top_level = item["snippet"]["topLevelComment"]
+                if since and top_level["snippet"]["publishedAt"] <= since:
+                    reached_known = True
                     break
+                comments.append(self._to_comment(video_id, top_level))
+                if include_replies:
+                    comments.extend(self._thread_replies(video_id, item))
 
-            return comments
-        except Exception as e:
-            self.logger.error(f"Error fetching comments: {e}")
-            return []
\ No newline at end of file
+            if comments:
+                newest = max(newest, max(comment['published_at'] for comment in comments))
+            total += len(comments)
+            metrics.count('youtube.comments', len(comments))
+
+            yield comments
+
+            page_token = None if reached_known else response.get("nextPageToken")
+            if page_token and (max_comments is None or total < max_comments):
+                self.state.save(video_id, {**state, 'page_token': page_token, 'pending_newest': newest})
+                continue
+
+            if page_token:
+                # Batas max_comments tercapai: sisanya dilanjutkan pada crawl berikutnya
+                self.state.save(video_id, {**state, 'page_token': page_token, 'pending_newest': newest})
+            else:
+                self.state.save(video_id, {'newest_published_at': newest or None})
+            return
@@ -0,0 +1,132 @@
+import time
+import json
+import logging
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Optional
+from config.settings import Settings
+
+# Context manager kosong yang dipakai ulang saat instrumentasi nonaktif
+_DISABLED = nullcontext()
+
+
+class Metrics:
+    """
+    Timer dan counter ringan per tahap pipeline. Saat nonaktif, timer() hanya
+    melakukan satu pengecekan boolean sehingga overhead-nya bisa diabaikan.
+    """
+
+    def __init__(self, enabled: bool = Settings.METRICS_ENABLED, log: bool = Settings.METRICS_LOG,
+                 namespace: str = 'knn_sentiment'):
+        self.enabled = enabled
+        self.log = log
+        self.namespace = namespace
+        self._stages: Dict[str, Dict] = {}
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._collectors: Dict[str, Callable[[], Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def timer(self, stage: str, rows: Optional[int] = None):
+        """``with metrics.timer('model.predict', rows=n): ...``"""
+        if not self.enabled:
+            return _DISABLED
+        return self._timer(stage, rows)
+
+    @contextmanager
+    def _timer(self, stage: str, rows: Optional[int]):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, rows)
+
+    def record(self, stage: str, seconds: float, rows: Optional[int] = None):
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._stages.setdefault(stage, {
+                'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0, 'total_rows': 0,
+                'last_seconds': 0.0, 'last_rows': None
+            })
+            stats['count'] += 1
+            stats['total_seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            stats['last_seconds'] = seconds
+            stats['last_rows'] = rows
+            if rows is not None:
+                stats['total_rows'] += rows
+        if self.log:
+            self.logger.info(json.dumps({'event': 'stage', 'stage': stage, 'seconds': round(seconds, 6), 'rows': rows}))
+
+    def count(self, name: str, value: float = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def gauge(self, name: str, value: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[name] = value
+
+    def register_collector(self, name: str, collector: Callable[[], Dict[str, float]]):
+        """Sumber gauge yang dibaca saat snapshot (mis. statistik pool); nama sama menimpa."""
+        with self._lock:
+            self._collectors[name] = collector
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            snapshot = {
+                'stages': {stage: dict(stats) for stage, stats in self._stages.items()},
+                'counters': dict(self._counters),
+                'gauges': dict(self._gauges)
+            }
+            collectors = list(self._collectors.values())
+        for collector in collectors:
+            try:
+                snapshot['gauges'].update(collector())
+            except Exception as e:
+                self.logger.error(f"Metrics collector error: {e}")
+        return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    @staticmethod
+    def _metric_name(name: str) -> str:
+        return ''.join(char if char.isalnum() else '_' for char in name)
+
+    def to_prometheus(self) -> str:
+        """Ekspor dalam format teks Prometheus (exposition format 0.0.4)."""
+        snapshot = self.snapshot()
+        prefix = self.namespace
+        lines = [
+            f"# HELP {prefix}_stage_seconds Waktu eksekusi per tahap pipeline.",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for stage, stats in sorted(snapshot['stages'].items()):
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {stats["total_seconds"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+        lines += [
+            f"# HELP {prefix}_stage_rows_total Jumlah baris yang diproses per tahap.",
+            f"# TYPE {prefix}_stage_rows_total counter",
+        ]
+        for stage, stats in sorted(snapshot['stages'].items()):
+            lines.append(f'{prefix}_stage_rows_total{{stage="{stage}"}} {stats["total_rows"]}')
+        for name, value in sorted(snapshot['counters'].items()):
+            metric = f"{prefix}_{self._metric_name(name)}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, value in sorted(snapshot['gauges'].items()):
+            metric = f"{prefix}_{self._metric_name(name)}"
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+        return '\n'.join(lines) + '\n'
+
+
+# Registry bersama untuk seluruh proses
+metrics = Metrics()
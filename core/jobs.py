@@ -0,0 +1,378 @@
+import json
+import logging
+import os
+import socket
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from config.settings import Settings
+from core.crawling import YouTubeCrawler
+from core.preprocessing import PreprocessCache, TextPreprocessor
+from core.modeling import SentimentClassifier
+from core.pipeline import SentimentPipeline
+from database.connection import DatabaseManager
+
+# Jenis job yang dikenali worker
+JOB_KINDS = ('crawl', 'preprocess', 'preprocess_test', 'train', 'predict')
+
+# Status job di tabel jobs
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+# Akhiran id worker job latar belakang di proses Streamlit (lihat app.py)
+APP_WORKER_SUFFIX = ':app'
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """Dilempar dari progress callback saat job dibatalkan"""
+
+
+class JobQueue:
+    """
+    Antrian job sederhana di tabel ``jobs``. UI cukup enqueue lalu polling status,
+    sedangkan pekerjaan berat dijalankan oleh worker (``python cli.py worker``).
+    """
+
+    def __init__(self, db_manager: DatabaseManager, worker_id: Optional[str] = None):
+        self.db_manager = db_manager
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.logger = logging.getLogger(__name__)
+
+    def enqueue(self, kind: str, payload: Optional[Dict] = None) -> int:
+        """
+        Menambahkan job baru dan mengembalikan id-nya
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Jenis job tidak dikenal: {kind}")
+
+        with self.db_manager.transaction() as cursor:
+            cursor.execute(
+                "INSERT INTO jobs (kind, payload, status) VALUES (%s, %s, %s)",
+                (kind, json.dumps(payload or {}), QUEUED)
+            )
+            return cursor.lastrowid
+
+    def _claim_job(self, job_id: int) -> bool:
+        with self.db_manager.transaction() as cursor:
+            cursor.execute("""
+                UPDATE jobs SET status = %s, worker = %s,
+                    started_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s AND status = %s
+            """, (RUNNING, self.worker_id, job_id, QUEUED))
+            return cursor.rowcount == 1
+
+    def claim(self, job_id: Optional[int] = None) -> Optional[Dict]:
+        """
+        Mengambil job antrian tertua (atau job tertentu jika job_id diisi). Update
+        bersyarat status='queued' memastikan satu job hanya diambil oleh satu worker
+        walaupun beberapa worker berjalan.
+        """
+        if job_id is not None:
+            return self.get(job_id) if self._claim_job(job_id) else None
+
+        while True:
+            candidate = self.db_manager.fetch_data(
+                "SELECT id FROM jobs WHERE status = %s ORDER BY id LIMIT 1", (QUEUED,)
+            )
+            if candidate.empty:
+                return None
+
+            job_id = int(candidate['id'].iloc[0])
+            if self._claim_job(job_id):
+                return self.get(job_id)
+
+    def update_progress(self, job_id: int, processed: int, total: int) -> bool:
+        """
+        Menyimpan progress; False jika job sudah tidak berjalan (mis. dibatalkan)
+        """
+        with self.db_manager.transaction() as cursor:
+            cursor.execute(
+                """
+                UPDATE jobs SET progress = %s, total = %s, updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s AND status = %s
+                """,
+                (processed, total, job_id, RUNNING)
+            )
+            return cursor.rowcount == 1
+
+    def progress_callback(self, job_id: int) -> Callable[[int, int], None]:
+        """
+        Callback progress untuk pipeline. Dipanggil di antara chunk, sehingga job yang
+        dibatalkan berhenti di batas chunk; chunk yang sudah tersimpan tetap ada dan
+        dilewati saat job dijalankan ulang.
+        """
+        def callback(processed: int, total: int):
+            if not self.update_progress(job_id, processed, total):
+                raise JobCancelled(f"Job {job_id} dibatalkan")
+        return callback
+
+    def complete(self, job_id: int, result: Optional[Dict] = None):
+        # Hanya job yang masih berjalan; job yang sudah dibatalkan tetap 'cancelled'
+        self.db_manager.execute_query("""
+            UPDATE jobs SET status = %s, result = %s, finished_at = CURRENT_TIMESTAMP
+            WHERE id = %s AND status = %s
+        """, (DONE, json.dumps(result or {}, default=str), job_id, RUNNING))
+
+    def fail(self, job_id: int, error: str):
+        self.db_manager.execute_query("""
+            UPDATE jobs SET status = %s, error = %s, finished_at = CURRENT_TIMESTAMP
+            WHERE id = %s AND status = %s
+        """, (FAILED, error, job_id, RUNNING))
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Membatalkan job yang masih antri atau berjalan. Job yang berjalan berhenti saat
+        memanggil progress callback berikutnya.
+        """
+        with self.db_manager.transaction() as cursor:
+            cursor.execute("""
+                UPDATE jobs SET status = %s, finished_at = CURRENT_TIMESTAMP
+                WHERE id = %s AND status IN (%s, %s)
+            """, (CANCELLED, job_id, *ACTIVE_STATUSES))
+            return cursor.rowcount == 1
+
+    def fail_orphaned(self, error: str) -> int:
+        """
+        Menandai gagal job 'running' milik worker_id ini yang tertinggal dari proses
+        sebelumnya (mis. aplikasi di-restart saat job berjalan)
+        """
+        with self.db_manager.transaction() as cursor:
+            cursor.execute("""
+                UPDATE jobs SET status = %s, error = %s, finished_at = CURRENT_TIMESTAMP
+                WHERE worker = %s AND status = %s
+            """, (FAILED, error, self.worker_id, RUNNING))
+            return cursor.rowcount
+
+    def fail_stale(self, timeout: float, error: str) -> int:
+        """
+        Menandai gagal job 'running' worker CLI mana pun yang progress-nya tidak
+        diperbarui selama timeout detik, mis. karena proses worker mati di tengah job.
+        Job milik app dilewati: tahap panjang seperti pelatihan model tidak mengirim
+        progress, dan job app yang tertinggal sudah ditangani fail_orphaned.
+        """
+        with self.db_manager.transaction() as cursor:
+            cursor.execute("""
+                UPDATE jobs SET status = %s, error = %s, finished_at = CURRENT_TIMESTAMP
+                WHERE status = %s AND worker NOT LIKE %s
+                  AND TIMESTAMPDIFF(SECOND, COALESCE(updated_at, started_at), CURRENT_TIMESTAMP) > %s
+            """, (FAILED, error, RUNNING, f"%{APP_WORKER_SUFFIX}", int(timeout)))
+            return cursor.rowcount
+
+    def _decode(self, row: Dict) -> Dict:
+        for column in ('payload', 'result'):
+            value = row.get(column)
+            row[column] = json.loads(value) if isinstance(value, str) and value else None
+        return row
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        data = self.db_manager.fetch_data("SELECT * FROM jobs WHERE id = %s", (job_id,))
+        if data.empty:
+            return None
+        return self._decode(data.iloc[0].to_dict())
+
+    def recent(self, limit: int = 20) -> List[Dict]:
+        """
+        Job terbaru untuk ditampilkan di UI
+        """
+        data = self.db_manager.fetch_data(
+            "SELECT * FROM jobs ORDER BY id DESC LIMIT %s", (int(limit),)
+        )
+        return [self._decode(row) for row in data.to_dict('records')]
+
+    def latest(self, kind: str, video_id: Optional[str] = None, limit: int = 50) -> Optional[Dict]:
+        """
+        Job terbaru suatu jenis (dan video, jika diisi) untuk ditampilkan ulang setelah rerun
+        """
+        data = self.db_manager.fetch_data(
+            "SELECT * FROM jobs WHERE kind = %s ORDER BY id DESC LIMIT %s", (kind, int(limit))
+        )
+        for row in data.to_dict('records'):
+            job = self._decode(row)
+            if video_id is None or video_id in (job['payload'] or {}).get('video_ids', []):
+                return job
+        return None
+
+
+class JobExecutor:
+    """
+    Menjalankan job di thread latar belakang milik proses aplikasi (dibuat sekali,
+    mis. lewat st.cache_resource), sehingga aksi panjang tidak memblokir halaman.
+    State dan progress disimpan di tabel jobs: rerun halaman cukup membaca job yang
+    sedang berjalan, dan beberapa job (mis. video berbeda) bisa berjalan bersamaan.
+
+    run_fn(kind, payload, progress_callback) -> hasil job (dict)
+    """
+
+    def __init__(self, queue: JobQueue, run_fn: Callable[[str, Dict, Callable[[int, int], None]], Dict],
+                 max_workers: int = Settings.JOB_EXECUTOR_WORKERS):
+        self.queue = queue
+        self.run_fn = run_fn
+        self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+
+        orphaned = self.queue.fail_orphaned("Dihentikan karena aplikasi di-restart")
+        if orphaned:
+            self.logger.warning(f"Marked {orphaned} orphaned job(s) as failed")
+
+    def submit(self, kind: str, payload: Optional[Dict] = None) -> int:
+        job_id = self.queue.enqueue(kind, payload)
+        self._executor.submit(self._run, job_id)
+        return job_id
+
+    def cancel(self, job_id: int) -> bool:
+        return self.queue.cancel(job_id)
+
+    def _run(self, job_id: int):
+        # Job bisa sudah dibatalkan selama antri, atau diambil worker CLI lebih dulu
+        job = self.queue.claim(job_id)
+        if job is None:
+            return
+
+        self.logger.info(f"Running job {job_id} ({job['kind']})")
+        try:
+            result = self.run_fn(job['kind'], job['payload'] or {}, self.queue.progress_callback(job_id))
+            self.queue.complete(job_id, result)
+        except JobCancelled:
+            self.logger.info(f"Job {job_id} cancelled")
+        except Exception as e:
+            self.logger.error(f"Job {job_id} failed: {e}")
+            self.queue.fail(job_id, str(e))
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+# Pipeline per proses (dibuat di initializer process pool)
+_pipeline: Optional[SentimentPipeline] = None
+
+
+def build_pipeline(requests_per_second: float = Settings.YOUTUBE_REQUESTS_PER_SECOND) -> SentimentPipeline:
+    db_manager = DatabaseManager()
+    result_cache = PreprocessCache(db_manager) if Settings.PREPROCESS_RESULT_CACHE else None
+    return SentimentPipeline(
+        db_manager, TextPreprocessor(result_cache=result_cache), SentimentClassifier(),
+        crawler=YouTubeCrawler(requests_per_second=requests_per_second)
+    )
+
+
+def _init_worker(requests_per_second: float):
+    global _pipeline
+    _pipeline = build_pipeline(requests_per_second)
+
+
+def _crawl_video(pipeline: SentimentPipeline, video_id: str,
+                 progress_callback: Optional[Callable[[int, int], None]] = None) -> Optional[Dict]:
+    return pipeline.crawl_video(video_id, progress_callback=progress_callback)
+
+
+def _run_in_worker(task: Callable, video_id: str) -> Optional[Dict]:
+    return task(_pipeline, video_id)
+
+
+def run_per_video(pipeline: SentimentPipeline, task: Callable[..., Optional[Dict]],
+                  video_ids: List[str], jobs: int = 1,
+                  progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Optional[Dict]]:
+    """
+    Menjalankan task(pipeline, video_id, progress_callback) untuk setiap video,
+    paralel di process pool jika jobs > 1 (progress lalu dilaporkan per video).
+    Kegagalan satu video tidak menghentikan video lain (hasilnya None), kecuali
+    job dibatalkan.
+    """
+    results = {}
+    if jobs <= 1 or len(video_ids) <= 1:
+        for video_id in video_ids:
+            try:
+                results[video_id] = task(pipeline, video_id, progress_callback)
+            except JobCancelled:
+                raise
+            except Exception as e:
+                logger.error(f"{task.__name__} failed for {video_id}: {e}")
+                results[video_id] = None
+        return results
+
+    # Setiap proses punya rate limiter sendiri: kuota request YouTube dibagi rata
+    # agar total semua proses tetap YOUTUBE_REQUESTS_PER_SECOND
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(Settings.YOUTUBE_REQUESTS_PER_SECOND / jobs,)) as executor:
+        futures = {video_id: executor.submit(_run_in_worker, task, video_id) for video_id in video_ids}
+        for done, (video_id, future) in enumerate(futures.items(), start=1):
+            try:
+                results[video_id] = future.result()
+            except Exception as e:
+                logger.error(f"{task.__name__} failed for {video_id}: {e}")
+                results[video_id] = None
+            if progress_callback:
+                try:
+                    progress_callback(done, len(video_ids))
+                except JobCancelled:
+                    for pending in futures.values():
+                        pending.cancel()
+                    raise
+    return results
+
+
+def run_job(pipeline: SentimentPipeline, kind: str, payload: Dict,
+            progress_callback: Optional[Callable[[int, int], None]] = None,
+            jobs: int = 1) -> Dict:
+    """
+    Menjalankan satu jenis pekerjaan; dipakai oleh subcommand CLI, worker dan job
+    latar belakang aplikasi
+    """
+    try:
+        return _run_job(pipeline, kind, payload, progress_callback, jobs)
+    finally:
+        # Cache stemming disimpan sekali per job, bukan per batch preprocessing
+        pipeline.preprocessor.save_stem_cache()
+
+
+def _run_job(pipeline: SentimentPipeline, kind: str, payload: Dict,
+             progress_callback: Optional[Callable[[int, int], None]], jobs: int) -> Dict:
+    video_ids = payload.get('video_ids') or []
+
+    if kind == 'crawl':
+        return run_per_video(pipeline, _crawl_video, video_ids, jobs, progress_callback)
+
+    if kind == 'preprocess':
+        return {'processed': pipeline.ingest_new_training(progress_callback)}
+
+    if kind == 'preprocess_test':
+        return {
+            video_id: {'processed': pipeline.preprocess_test_video(video_id, progress_callback)}
+            for video_id in video_ids
+        }
+
+    if kind == 'train':
+        model_result = pipeline.load_or_train_model()
+        return {'accuracy': model_result['accuracy'], 'fingerprint': model_result.get('fingerprint')}
+
+    if kind == 'predict':
+        # Model dimuat sekali, lalu semua video diprediksi dalam satu batch (komentar
+        # yang sudah punya prediksi dilewati); jobs > 1 menentukan jumlah thread KNN
+        pipeline.load_or_train_model()
+        n_jobs = jobs if jobs > 1 else Settings.PREDICT_JOBS
+        return pipeline.predict_videos(video_ids, progress_callback=progress_callback, n_jobs=n_jobs)
+
+    raise ValueError(f"Jenis job tidak dikenal: {kind}")
+
+
+def failed_videos(kind: str, result: Dict) -> List[str]:
+    """
+    Video yang gagal diproses pada hasil crawl per video (prediksi batch gagal sekaligus)
+    """
+    if kind != 'crawl':
+        return []
+    return [str(key) for key, value in result.items() if value is None]
+
+
+def execute_job(pipeline: SentimentPipeline, kind: str, payload: Dict,
+                progress_callback: Optional[Callable[[int, int], None]] = None,
+                jobs: int = 1) -> Dict:
+    """
+    run_job untuk job dari antrian: video yang gagal membuat job gagal
+    """
+    result = run_job(pipeline, kind, payload, progress_callback, jobs)
+    failed = failed_videos(kind, result)
+    if failed:
+        raise RuntimeError(f"Gagal untuk video: {', '.join(failed)}")
+    return result
@@ -1,55 +1,552 @@
+import os
+import glob
+import uuid
+import json
+import time
+import shutil
+import threading
+import hashlib
+import logging
+import joblib
 import numpy as np
 import pandas as pd
-from typing import Dict
+import scipy.sparse as sp
+from contextlib import contextmanager
+from joblib import Parallel, delayed
+from typing import Dict, List, Optional
 from sklearn.neighbors import KNeighborsClassifier
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.model_selection import train_test_split, StratifiedKFold
 from sklearn.metrics import classification_report, accuracy_score
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import Normalizer
+from sklearn.pipeline import make_pipeline
+from config.settings import Settings
+from core.instrumentation import metrics
+from core.neighbors import (
+    CosineKNNClassifier, LSHKNNClassifier, neighbor_recall, weighted_vote, cross_fold_neighbors
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa kunci antar proses
+    fcntl = None
+
+# Naikkan jika struktur artefak yang disimpan berubah
+MODEL_FORMAT_VERSION = 3
+
+# Metric yang didukung evaluate()
+EVALUATION_METRICS = ('euclidean', 'cosine')
+
+# Backend pencarian tetangga yang bisa dipilih lewat konstruktor
+KNN_BACKENDS = {
+    'sklearn': KNeighborsClassifier,  # bawaan scikit-learn (brute force pada input sparse)
+    'cosine': CosineKNNClassifier,  # exact, perkalian matriks sparse + top-k
+    'lsh': LSHKNNClassifier,  # approximate, random-projection LSH
+}
+
+
+@contextmanager
+def _artifact_lock(directory: str, exclusive: bool):
+    """
+    Kunci file pada direktori artefak, berlaku antar proses (app dan worker cli.py).
+    Penyimpanan memakai kunci eksklusif, pemuatan memakai kunci bersama.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(directory, '.lock'), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
 
 class SentimentClassifier:
-    def __init__(self, n_neighbors: int = 5):
-        self.vectorizer = TfidfVectorizer()
-        self.knn = KNeighborsClassifier(n_neighbors=n_neighbors)
+    def __init__(self, n_neighbors: int = 5, backend: str = Settings.KNN_BACKEND,
+                 n_components: Optional[int] = Settings.SVD_COMPONENTS,
+                 max_features: Optional[int] = Settings.TFIDF_MAX_FEATURES,
+                 min_df: int = Settings.TFIDF_MIN_DF, max_df: float = 1.0,
+                 vectorizer: str = Settings.VECTORIZER,
+                 rebuild_ratio: float = Settings.MODEL_REBUILD_RATIO):
+        """
+        n_components: jika diisi, vektor TF-IDF direduksi dengan TruncatedSVD (LSA)
+        menjadi matriks dense float32 berdimensi tersebut sebelum KNN.
+        max_features/min_df/max_df: pemangkasan kosakata TfidfVectorizer.
+        vectorizer: 'tfidf' atau 'hashing' (tanpa kosakata, sehingga data baru
+        bisa ditambahkan lewat partial_fit tanpa pernah perlu rebuild).
+        rebuild_ratio: batas proporsi data yang ditambahkan lewat partial_fit
+        sebelum needs_rebuild bernilai True.
+        """
+        if backend not in KNN_BACKENDS:
+            raise ValueError(f"Unknown KNN backend '{backend}', choose one of {sorted(KNN_BACKENDS)}")
+        if vectorizer not in ('tfidf', 'hashing'):
+            raise ValueError(f"Unknown vectorizer '{vectorizer}', choose 'tfidf' or 'hashing'")
+        self.n_neighbors = n_neighbors
+        self.backend = backend
+        self.n_components = n_components
+        self.max_features = max_features
+        self.min_df = min_df
+        self.max_df = max_df
+        self.vectorizer_type = vectorizer
+        self.rebuild_ratio = rebuild_ratio
+        if vectorizer == 'hashing':
+            self.vectorizer = HashingVectorizer(alternate_sign=False, norm='l2')
+        else:
+            self.vectorizer = TfidfVectorizer(max_features=max_features, min_df=min_df, max_df=max_df)
+        self.reducer = None
+        self.knn = KNN_BACKENDS[backend](n_neighbors=n_neighbors)
+        # Matriks dan label yang tersimpan di indeks KNN (untuk partial_fit)
+        self.X_fit_ = None
+        self.y_fit_ = None
+        self.appended_rows = 0
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _compact(X_vectorized):
+        # Matriks training disimpan float32 (format yang sama dengan artefak di disk)
+        return X_vectorized.astype(np.float32, copy=False)
+
+    def _fit_knn(self, X_vectorized, y):
+        self.X_fit_ = self._compact(X_vectorized)
+        self.y_fit_ = np.asarray(y)
+        self.appended_rows = 0
+        self._fit_index()
+
+    def _fit_index(self):
+        # Hasil vektorisasi sudah ternormalisasi L2, jadi backend cosine/LSH memakai
+        # matriksnya langsung tanpa salinan (termasuk matriks memory-mapped)
+        if isinstance(self.knn, CosineKNNClassifier):
+            self.knn.fit(self.X_fit_, self.y_fit_, normalized=True)
+        else:
+            self.knn.fit(self.X_fit_, self.y_fit_)
+
+    def _fit_transform(self, X: pd.Series):
+        X_tfidf = self.vectorizer.fit_transform(X)
+        if not self.n_components:
+            return X_tfidf, X_tfidf
+
+        # LSA: SVD lalu normalisasi ulang agar jarak tetap setara cosine
+        n_components = min(self.n_components, max(1, X_tfidf.shape[1] - 1))
+        self.reducer = make_pipeline(
+            TruncatedSVD(n_components=n_components, random_state=42),
+            Normalizer(copy=False)
+        )
+        X_reduced = self.reducer.fit_transform(X_tfidf)
+        return X_tfidf, np.ascontiguousarray(X_reduced, dtype=np.float32)
+
+    def _transform(self, texts: pd.Series):
+        X_vectorized = self.vectorizer.transform(texts)
+        if self.reducer is None:
+            return X_vectorized
+        return np.ascontiguousarray(self.reducer.transform(X_vectorized), dtype=np.float32)
+
+    @staticmethod
+    def _timed_evaluation(knn, X_train, X_val, y_train, y_val) -> Dict:
+        start = time.perf_counter()
+        knn.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        y_pred = knn.predict(X_val)
+        predict_seconds = time.perf_counter() - start
+
+        return {
+            'y_pred': y_pred,
+            'accuracy': accuracy_score(y_val, y_pred),
+            'dimensions': X_train.shape[1],
+            'fit_seconds': fit_seconds,
+            'predict_seconds': predict_seconds
+        }
         
-    def train(self, X: pd.Series, y: pd.Series) -> Dict:
+    def fit(self, X: pd.Series, y: pd.Series) -> 'SentimentClassifier':
+        """
+        Melatih model pada seluruh data tanpa evaluasi, untuk dipakai prediksi
+        """
+        _, X_vectorized = self._fit_transform(X)
+        self._fit_knn(X_vectorized, y)
+        return self
+
+    def partial_fit(self, X: pd.Series, y: pd.Series) -> 'SentimentClassifier':
+        """
+        Menambahkan data training baru ke indeks KNN tanpa vektorisasi ulang seluruh
+        korpus. Kosakata/IDF (dan SVD) tetap dari pelatihan terakhir; cek needs_rebuild.
         """
-        Melatih model dengan validasi silang
+        if self.X_fit_ is None:
+            raise ValueError("Model belum dilatih, panggil fit() atau train() terlebih dahulu")
+        if len(X) == 0:
+            return self
+
+        X_new = self._compact(self._transform(X))
+        if sp.issparse(self.X_fit_):
+            self.X_fit_ = sp.vstack([self.X_fit_, X_new], format='csr')
+        else:
+            self.X_fit_ = np.ascontiguousarray(np.vstack([self.X_fit_, X_new]))
+        self.y_fit_ = np.concatenate([self.y_fit_, np.asarray(y)])
+        self.appended_rows += len(X)
+
+        # Indeks KNN brute force hanya menyimpan matriks, jadi fit ulang murah
+        self._fit_index()
+        return self
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """
+        True jika data yang ditambahkan lewat partial_fit sudah terlalu banyak untuk
+        kosakata/IDF lama. Vectorizer hashing tanpa SVD tidak pernah perlu rebuild.
+        """
+        if self.vectorizer_type == 'hashing' and self.reducer is None:
+            return False
+        base_rows = len(self.y_fit_) - self.appended_rows if self.y_fit_ is not None else 0
+        return self.appended_rows > self.rebuild_ratio * base_rows
+
+    def train(self, X: pd.Series, y: pd.Series, cv: Optional[int] = None,
+              n_jobs: Optional[int] = None) -> Dict:
+        """
+        Melatih model dengan split 80/20; cross-validation hanya jika cv diisi
+        (lihat evaluate() untuk evaluasi dan grid search terpisah)
         """
-        # Vektorisasi
-        X_vectorized = self.vectorizer.fit_transform(X)
+        # Vektorisasi (dan reduksi dimensi jika diaktifkan)
+        with metrics.timer('model.vectorize_fit', rows=len(X)):
+            X_tfidf, X_vectorized = self._fit_transform(X)
         
         # Split data
-        X_train, X_val, y_train, y_val = train_test_split(
-            X_vectorized, y, test_size=0.2, random_state=42
+        X_tfidf_train, X_tfidf_val, X_train, X_val, y_train, y_val = train_test_split(
+            X_tfidf, X_vectorized, y, test_size=0.2, random_state=42
         )
         
-        # Pelatihan
-        self.knn.fit(X_train, y_train)
-        
-        # Prediksi
-        y_pred = self.knn.predict(X_val)
+        # Pelatihan dan prediksi
+        X_train = self._compact(X_train)
+        with metrics.timer('model.knn_fit_validate', rows=len(y)):
+            evaluation = self._timed_evaluation(self.knn, X_train, X_val, y_train, y_val)
+        y_pred = evaluation.pop('y_pred')
+        self.X_fit_, self.y_fit_, self.appended_rows = X_train, np.asarray(y_train), 0
         
         # Evaluasi
-        accuracy = accuracy_score(y_val, y_pred)
+        accuracy = evaluation['accuracy']
         report = classification_report(y_val, y_pred, output_dict=True)
         
-        # Cross-validation untuk estimasi performa
-        cv_scores = cross_val_score(self.knn, X_vectorized, y, cv=5)
-        
-        return {
+        result = {
             'model': self.knn,
             'vectorizer': self.vectorizer,
             'accuracy': accuracy,
-            'report': report,
-            'cv_scores': {
-                'mean': np.mean(cv_scores),
-                'std': np.std(cv_scores)
-            }
+            'report': report
         }
+        
+        # Cross-validation untuk estimasi performa (opsional)
+        if cv:
+            cv_evaluation = self._evaluate_vectorized(X_vectorized, y, cv=cv, n_jobs=n_jobs)
+            result['cv_scores'] = {
+                'mean': cv_evaluation['best_score'],
+                'std': cv_evaluation['results'][0]['std']
+            }
+        
+        # Bandingkan akurasi dan latensi TF-IDF sparse dengan hasil reduksi SVD
+        if self.reducer is not None:
+            sparse_evaluation = self._timed_evaluation(
+                KNN_BACKENDS[self.backend](n_neighbors=self.n_neighbors),
+                X_tfidf_train, X_tfidf_val, y_train, y_val
+            )
+            sparse_evaluation.pop('y_pred')
+            result['comparison'] = {'sparse': sparse_evaluation, 'reduced': evaluation}
+        
+        # Backend approximate: laporkan recall tetangga dibanding pencarian exact
+        if self.backend == 'lsh':
+            exact = CosineKNNClassifier(n_neighbors=self.n_neighbors).fit(X_train, y_train)
+            result['neighbor_recall'] = neighbor_recall(self.knn, exact, X_val)
+        
+        return result
     
-    def predict(self, texts: pd.Series) -> np.ndarray:
+    def evaluate(self, X: pd.Series, y: pd.Series, cv: int = 5, n_jobs: Optional[int] = None,
+                 param_grid: Optional[Dict[str, List]] = None) -> Dict:
         """
-        Memprediksi sentimen untuk teks baru
+        Evaluasi k-fold dan grid search atas n_neighbors, metric ('euclidean'/'cosine')
+        dan weights ('uniform'/'distance'). Vektorisasi dan similarity antar data
+        dihitung sekali lalu dipakai ulang untuk semua fold dan kandidat, tanpa
+        melatih ulang per kandidat. Model milik objek ini tidak diubah.
         """
-        X_vectorized = self.vectorizer.transform(texts)
-        return self.knn.predict(X_vectorized)
\ No newline at end of file
+        evaluator = SentimentClassifier(
+            n_neighbors=self.n_neighbors, backend=self.backend, n_components=self.n_components,
+            max_features=self.max_features, min_df=self.min_df, max_df=self.max_df,
+            vectorizer=self.vectorizer_type
+        )
+        _, X_vectorized = evaluator._fit_transform(X)
+        return self._evaluate_vectorized(X_vectorized, y, cv=cv, n_jobs=n_jobs, param_grid=param_grid)
+
+    def _evaluate_vectorized(self, X_vectorized, y: pd.Series, cv: int = 5, n_jobs: Optional[int] = None,
+                             param_grid: Optional[Dict[str, List]] = None) -> Dict:
+        grid = {
+            'n_neighbors': [self.n_neighbors],
+            # Metric bawaan KNeighborsClassifier adalah euclidean, backend lain memakai cosine
+            'metric': ['euclidean' if self.backend == 'sklearn' else 'cosine'],
+            'weights': ['uniform'],
+            **(param_grid or {})
+        }
+        unknown_metrics = set(grid['metric']) - set(EVALUATION_METRICS)
+        if unknown_metrics:
+            raise ValueError(f"Unsupported metric(s) {sorted(unknown_metrics)}, choose from {EVALUATION_METRICS}")
+
+        classes, y_encoded = np.unique(np.asarray(y), return_inverse=True)
+        folds = np.empty(len(y_encoded), dtype=np.int64)
+        splitter = StratifiedKFold(n_splits=cv)
+        for fold, (_, test_index) in enumerate(splitter.split(np.zeros(len(y_encoded)), y_encoded)):
+            folds[test_index] = fold
+
+        results = []
+        for metric in grid['metric']:
+            # Satu komputasi jarak per metric untuk semua fold, k dan weights
+            distances, neighbors = cross_fold_neighbors(
+                X_vectorized, folds, max(grid['n_neighbors']), metric=metric, n_jobs=n_jobs
+            )
+            neighbor_labels = y_encoded[neighbors]
+            for weights in grid['weights']:
+                for k in grid['n_neighbors']:
+                    predictions = weighted_vote(
+                        neighbor_labels[:, :k], distances[:, :k], weights, len(classes)
+                    )
+                    correct = predictions == y_encoded
+                    scores = [float(correct[folds == fold].mean()) for fold in range(cv)]
+                    results.append({
+                        'n_neighbors': k,
+                        'metric': metric,
+                        'weights': weights,
+                        'mean': float(np.mean(scores)),
+                        'std': float(np.std(scores)),
+                        'scores': scores
+                    })
+
+        results.sort(key=lambda r: r['mean'], reverse=True)
+        best = results[0]
+        return {
+            'best_params': {key: best[key] for key in ('n_neighbors', 'metric', 'weights')},
+            'best_score': best['mean'],
+            'results': results
+        }
+
+    def predict(self, texts: pd.Series, n_jobs: Optional[int] = None,
+                min_rows_per_job: int = 500) -> np.ndarray:
+        """
+        Memprediksi sentimen untuk teks baru. Dengan n_jobs > 1 (atau -1 untuk semua
+        core) pencarian tetangga dibagi per blok baris ke beberapa thread.
+        """
+        # Komentar identik (spam, copy-paste) cukup divektorisasi dan dicari sekali
+        codes, unique_texts = pd.factorize(pd.Series(texts, dtype=object).fillna(''))
+        if len(unique_texts) < len(codes):
+            metrics.count('model.duplicate_texts', len(codes) - len(unique_texts))
+
+        with metrics.timer('model.vectorize', rows=len(unique_texts)):
+            X_vectorized = self._transform(pd.Series(unique_texts))
+
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        n_blocks = min(n_jobs or 1, len(unique_texts) // min_rows_per_job)
+        with metrics.timer('model.knn_predict', rows=len(unique_texts)):
+            if n_blocks <= 1:
+                predictions = self.knn.predict(X_vectorized)
+            else:
+                bounds = np.linspace(0, X_vectorized.shape[0], n_blocks + 1).astype(int)
+                blocks = Parallel(n_jobs=n_blocks, prefer='threads')(
+                    delayed(self.knn.predict)(X_vectorized[start:end])
+                    for start, end in zip(bounds[:-1], bounds[1:])
+                )
+                predictions = np.concatenate(blocks)
+        return predictions[codes]
+
+    def neighbor_recall(self, texts: pd.Series) -> float:
+        """
+        Recall tetangga backend saat ini dibanding pencarian cosine exact
+        """
+        X_vectorized = self._transform(texts)
+        exact = CosineKNNClassifier(n_neighbors=self.n_neighbors).fit(self.X_fit_, self.y_fit_)
+        return neighbor_recall(self.knn, exact, X_vectorized)
+
+    @staticmethod
+    def fingerprint(X: pd.Series, y: pd.Series) -> str:
+        """
+        Sidik jari data training, dipakai sebagai kunci artefak model
+        """
+        hasher = hashlib.sha256()
+        for text, label in zip(X, y):
+            hasher.update(f"{text}\t{label}\n".encode('utf-8'))
+        return hasher.hexdigest()
+
+    def _config_key(self) -> str:
+        """Kunci pendek konfigurasi model (backend, k, vectorizer, kosakata, SVD)"""
+        config = (
+            self.backend, self.n_neighbors, self.n_components, self.vectorizer_type,
+            self.max_features, self.min_df, self.max_df
+        )
+        return hashlib.sha1(repr(config).encode('utf-8')).hexdigest()[:8]
+
+    def _artifact_prefix(self) -> str:
+        return f"knn-v{MODEL_FORMAT_VERSION}-{self.backend}-k{self.n_neighbors}-{self._config_key()}"
+
+    def _artifact_path(self, directory: str, fingerprint: str) -> str:
+        return os.path.join(directory, f"{self._artifact_prefix()}-{fingerprint[:16]}.joblib")
+
+    def _prune_artifacts(self, directory: str, keep) -> None:
+        """
+        Menghapus artefak, direktori matriks, dan sisa file sementara berprefiks sama
+        selain yang ada di keep. Dipanggil di bawah kunci eksklusif setelah save berhasil.
+        """
+        for entry in glob.glob(os.path.join(glob.escape(directory), f"{self._artifact_prefix()}-*")):
+            if entry in keep:
+                continue
+            try:
+                if os.path.isdir(entry):
+                    shutil.rmtree(entry)
+                else:
+                    os.remove(entry)
+            except OSError as e:
+                self.logger.warning(f"Could not remove old model artifact {entry}: {e}")
+
+    @staticmethod
+    def save_matrix(directory: str, X, y):
+        """
+        Menyimpan matriks training dalam format ringkas: CSR (data float32, indices
+        int32, indptr) atau matriks padat float32 untuk LSA, plus kode label. Setiap
+        array berupa file .npy terpisah agar bisa di-memory-map saat dimuat.
+        """
+        os.makedirs(directory, exist_ok=True)
+        classes, codes = np.unique(np.asarray(y), return_inverse=True)
+        meta = {'shape': list(X.shape), 'classes': classes.tolist()}
+
+        if sp.issparse(X):
+            X = X.tocsr()
+            index_dtype = np.int32 if X.nnz < np.iinfo(np.int32).max else np.int64
+            meta['format'] = 'csr'
+            np.save(os.path.join(directory, 'data.npy'), X.data.astype(np.float32, copy=False))
+            np.save(os.path.join(directory, 'indices.npy'), X.indices.astype(np.int32, copy=False))
+            np.save(os.path.join(directory, 'indptr.npy'), X.indptr.astype(index_dtype, copy=False))
+        else:
+            meta['format'] = 'dense'
+            np.save(os.path.join(directory, 'matrix.npy'), np.ascontiguousarray(X, dtype=np.float32))
+
+        label_dtype = np.int16 if len(classes) < np.iinfo(np.int16).max else np.int32
+        np.save(os.path.join(directory, 'labels.npy'), codes.astype(label_dtype))
+        with open(os.path.join(directory, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+    @staticmethod
+    def load_matrix(directory: str, mmap: bool = True):
+        """
+        Memuat matriks dari save_matrix. Dengan mmap=True array dipetakan dari disk
+        (read-only) sehingga beberapa proses worker berbagi satu salinan fisik di
+        page cache, dan csr_matrix dibangun di atasnya tanpa menyalin.
+        """
+        mmap_mode = 'r' if mmap else None
+        with open(os.path.join(directory, 'meta.json')) as f:
+            meta = json.load(f)
+
+        def load(name):
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+
+        if meta['format'] == 'csr':
+            X = sp.csr_matrix(
+                (load('data'), load('indices'), load('indptr')),
+                shape=tuple(meta['shape']), copy=False
+            )
+        else:
+            X = load('matrix')
+        y = np.asarray(meta['classes'], dtype=object)[load('labels')]
+        return X, y
+
+    def save(self, directory: str, fingerprint: str, result: Dict, last_id: Optional[int] = None) -> str:
+        """
+        Menyimpan vectorizer dan model KNN yang sudah dilatih ke disk.
+        last_id: id preprocessed_training terakhir yang sudah masuk ke model.
+        Matriks training disimpan terpisah (save_matrix); indeks KNN dibangun ulang
+        di atasnya saat dimuat.
+        Artefak lama dengan konfigurasi yang sama dihapus setelah penyimpanan berhasil.
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = self._artifact_path(directory, fingerprint)
+
+        with _artifact_lock(directory, exclusive=True):
+            # Direktori matriks baru per penyimpanan, sehingga matriks yang sedang
+            # di-mmap proses lain tidak pernah ditimpa
+            matrix_dir = f"{path[:-len('.joblib')]}.{uuid.uuid4().hex[:12]}.matrix"
+            self.save_matrix(matrix_dir, self.X_fit_, self.y_fit_)
+
+            artifact = {
+                'format_version': MODEL_FORMAT_VERSION,
+                'fingerprint': fingerprint,
+                'vectorizer': self.vectorizer,
+                'reducer': self.reducer,
+                'matrix': os.path.basename(matrix_dir),
+                'appended_rows': self.appended_rows,
+                'last_id': last_id,
+                # Simpan hasil evaluasi tanpa objek model agar tidak terduplikasi
+                'result': {
+                    key: value for key, value in result.items()
+                    if key not in ('model', 'vectorizer', 'fingerprint', 'last_id')
+                }
+            }
+
+            # Tulis ke file sementara lalu rename agar pembaca tidak melihat file setengah jadi
+            tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+            joblib.dump(artifact, tmp_path)
+            os.replace(tmp_path, path)
+
+            # Artefak lama dengan konfigurasi yang sama tidak dipakai lagi
+            # (load_latest selalu mengambil yang terbaru)
+            self._prune_artifacts(directory, keep=(path, matrix_dir))
+        self.logger.info(f"Model artifact saved: {path}")
+        return path
+
+    def load(self, directory: str, fingerprint: str) -> Optional[Dict]:
+        """
+        Memuat artefak model untuk data training dengan sidik jari yang sama.
+        Mengembalikan hasil evaluasi saat pelatihan, atau None jika tidak ada.
+        """
+        path = self._artifact_path(directory, fingerprint)
+        if not os.path.exists(path):
+            return None
+        return self._load_artifact(path, fingerprint)
+
+    def load_latest(self, directory: str) -> Optional[Dict]:
+        """
+        Memuat artefak terbaru dengan konfigurasi yang sama, apa pun data trainingnya
+        (dasar untuk update inkremental). Hasilnya berisi 'fingerprint' dan 'last_id'.
+        """
+        paths = glob.glob(os.path.join(directory, f"{self._artifact_prefix()}-*.joblib"))
+        for path in sorted(paths, key=os.path.getmtime, reverse=True):
+            result = self._load_artifact(path)
+            if result is not None:
+                return result
+        return None
+
+    def _load_artifact(self, path: str, fingerprint: Optional[str] = None) -> Optional[Dict]:
+        # Kunci bersama: penyimpanan di proses lain tidak menghapus matriks di tengah pemuatan
+        with _artifact_lock(os.path.dirname(path), exclusive=False):
+            try:
+                artifact = joblib.load(path)
+            except Exception as e:
+                self.logger.error(f"Error loading model artifact {path}: {e}")
+                return None
+
+            if (artifact.get('format_version') != MODEL_FORMAT_VERSION
+                    or (fingerprint is not None and artifact.get('fingerprint') != fingerprint)):
+                self.logger.warning(f"Ignoring stale model artifact: {path}")
+                return None
+
+            try:
+                X_fit, y_fit = self.load_matrix(
+                    os.path.join(os.path.dirname(path), artifact['matrix']), mmap=Settings.MODEL_MMAP
+                )
+            except (OSError, ValueError, KeyError) as e:
+                self.logger.error(f"Error loading training matrix for {path}: {e}")
+                return None
+
+        self.vectorizer = artifact['vectorizer']
+        self.reducer = artifact.get('reducer')
+        self.X_fit_, self.y_fit_ = X_fit, y_fit
+        self._fit_index()
+        self.appended_rows = artifact['appended_rows']
+        return {
+            **artifact['result'],
+            'fingerprint': artifact['fingerprint'],
+            'last_id': artifact.get('last_id'),
+            'model': self.knn,
+            'vectorizer': self.vectorizer
+        }
@@ -0,0 +1,219 @@
+import numpy as np
+import scipy.sparse as sp
+from typing import Optional, Tuple
+from joblib import Parallel, delayed
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.preprocessing import normalize
+
+
+class CosineKNNClassifier(BaseEstimator, ClassifierMixin):
+    """
+    KNN exact dengan cosine similarity: vektor dinormalisasi L2 lalu kemiripan
+    dihitung sebagai perkalian matriks sparse per batch dengan seleksi top-k.
+    Untuk TF-IDF (sudah ternormalisasi) urutan tetangganya sama dengan jarak
+    euclidean bawaan KNeighborsClassifier, kecuali untuk dokumen kosong (vektor
+    nol), yang pada euclidean berjarak 1 dari semua data.
+    """
+
+    def __init__(self, n_neighbors: int = 5, max_batch_elements: int = 2 ** 24):
+        self.n_neighbors = n_neighbors
+        self.max_batch_elements = max_batch_elements
+
+    def fit(self, X, y, normalized: bool = False):
+        """
+        normalized=True: X sudah ternormalisasi L2 (output TF-IDF/hashing/LSA) dan
+        dipakai apa adanya tanpa disalin, misalnya matriks memory-mapped dari disk.
+        """
+        if normalized:
+            self._fit_X = X.tocsr() if sp.issparse(X) else np.asarray(X)
+        else:
+            self._fit_X = normalize(X).tocsr() if sp.issparse(X) else normalize(np.asarray(X, dtype=np.float32))
+        self.classes_, self._y = np.unique(np.asarray(y), return_inverse=True)
+        return self
+
+    def _similarity(self, X_query, candidates: Optional[np.ndarray] = None) -> np.ndarray:
+        # Training @ query.T lalu ditranspos: hanya batch query yang dikonversi,
+        # matriks training (bisa memory-mapped) tidak pernah disalin
+        X_train = self._fit_X if candidates is None else self._fit_X[candidates]
+        X_query_T = X_query.T.tocsr() if sp.issparse(X_query) else X_query.T
+        similarity = (X_train @ X_query_T).T
+        return similarity.toarray() if sp.issparse(similarity) else np.asarray(similarity)
+
+    @staticmethod
+    def _top_k(similarity: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        if k < similarity.shape[1]:
+            index = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        else:
+            index = np.tile(np.arange(similarity.shape[1]), (similarity.shape[0], 1))
+        top = np.take_along_axis(similarity, index, axis=1)
+        order = np.argsort(-top, axis=1, kind='stable')
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(index, order, axis=1)
+
+    def _prepare_query(self, X):
+        X = normalize(X) if sp.issparse(X) else normalize(np.asarray(X, dtype=np.float32))
+        return X.tocsr() if sp.issparse(X) else X
+
+    def kneighbors(self, X, n_neighbors: Optional[int] = None,
+                   return_distance: bool = True):
+        """Tetangga terdekat; jarak = 1 - cosine similarity"""
+        k = min(n_neighbors or self.n_neighbors, self._fit_X.shape[0])
+        X = self._prepare_query(X)
+
+        # Batasi ukuran matriks similarity dense per batch
+        batch_size = max(1, self.max_batch_elements // max(1, self._fit_X.shape[0]))
+        similarities, indices = [], []
+        for start in range(0, X.shape[0], batch_size):
+            top, index = self._top_k(self._similarity(X[start:start + batch_size]), k)
+            similarities.append(top)
+            indices.append(index)
+
+        distances = 1 - np.vstack(similarities) if similarities else np.empty((0, k))
+        indices = np.vstack(indices) if indices else np.empty((0, k), dtype=int)
+        return (distances, indices) if return_distance else indices
+
+    def predict(self, X) -> np.ndarray:
+        indices = self.kneighbors(X, return_distance=False)
+        votes = np.zeros((indices.shape[0], len(self.classes_)), dtype=np.int32)
+        np.add.at(votes, (np.arange(indices.shape[0])[:, None], self._y[indices]), 1)
+        # Seri dimenangkan kelas terkecil, sama seperti KNeighborsClassifier
+        return self.classes_[np.argmax(votes, axis=1)]
+
+
+class LSHKNNClassifier(CosineKNNClassifier):
+    """
+    KNN approximate: random-projection LSH (beberapa tabel hash hyperplane) untuk
+    memilih kandidat, lalu kandidat di-rerank dengan cosine similarity exact.
+    Query yang kandidatnya kurang dari k jatuh kembali ke pencarian exact.
+    """
+
+    def __init__(self, n_neighbors: int = 5, n_tables: int = 8, n_bits: int = 12,
+                 random_state: int = 42, max_batch_elements: int = 2 ** 24):
+        super().__init__(n_neighbors=n_neighbors, max_batch_elements=max_batch_elements)
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.random_state = random_state
+
+    def _hash(self, X) -> np.ndarray:
+        """Kunci bucket per tabel, bentuk (n_samples, n_tables)"""
+        projected = X @ self._planes
+        bits = (np.asarray(projected) > 0).reshape(X.shape[0], self.n_tables, self.n_bits)
+        return bits.astype(np.int64) @ (1 << np.arange(self.n_bits, dtype=np.int64))
+
+    def fit(self, X, y, normalized: bool = False):
+        super().fit(X, y, normalized=normalized)
+        rng = np.random.default_rng(self.random_state)
+        self._planes = rng.standard_normal(
+            (self._fit_X.shape[1], self.n_tables * self.n_bits)
+        ).astype(np.float32)
+
+        keys = self._hash(self._fit_X)
+        self._buckets = []
+        for table in range(self.n_tables):
+            order = np.argsort(keys[:, table], kind='stable')
+            unique_keys, starts = np.unique(keys[order, table], return_index=True)
+            self._buckets.append({
+                key: members for key, members in zip(unique_keys.tolist(), np.split(order, starts[1:]))
+            })
+        return self
+
+    def kneighbors(self, X, n_neighbors: Optional[int] = None,
+                   return_distance: bool = True):
+        k = min(n_neighbors or self.n_neighbors, self._fit_X.shape[0])
+        X = self._prepare_query(X)
+        keys = self._hash(X)
+        empty = np.empty(0, dtype=np.int64)
+
+        distances = np.empty((X.shape[0], k))
+        indices = np.empty((X.shape[0], k), dtype=np.int64)
+        for row in range(X.shape[0]):
+            candidates = np.unique(np.concatenate([
+                self._buckets[table].get(key, empty) for table, key in enumerate(keys[row].tolist())
+            ]))
+            query = X[row:row + 1]
+            if len(candidates) < k:
+                top, index = self._top_k(self._similarity(query), k)
+            else:
+                top, index = self._top_k(self._similarity(query, candidates), k)
+                index = candidates[index]
+            distances[row], indices[row] = 1 - top[0], index[0]
+
+        return (distances, indices) if return_distance else indices
+
+
+def neighbor_recall(approximate, exact, X, n_neighbors: Optional[int] = None) -> float:
+    """Rata-rata proporsi tetangga exact yang juga ditemukan oleh backend approximate"""
+    found = approximate.kneighbors(X, n_neighbors, return_distance=False)
+    expected = exact.kneighbors(X, n_neighbors, return_distance=False)
+    if expected.size == 0:
+        return 1.0
+    hits = sum(len(np.intersect1d(a, e)) for a, e in zip(found, expected))
+    return hits / expected.size
+
+
+def weighted_vote(labels: np.ndarray, distances: np.ndarray, weights: str, n_classes: int) -> np.ndarray:
+    """
+    Voting kelas dari label tetangga (sudah di-encode 0..n_classes-1).
+    weights='distance' mengikuti KNeighborsClassifier: bobot 1/jarak, dan jika ada
+    tetangga berjarak nol hanya tetangga tersebut yang dihitung.
+    """
+    if weights == 'uniform':
+        vote_weights = np.ones(labels.shape)
+    elif weights == 'distance':
+        with np.errstate(divide='ignore'):
+            vote_weights = 1.0 / distances
+        exact = np.isinf(vote_weights)
+        rows = exact.any(axis=1)
+        vote_weights[rows] = exact[rows]
+    else:
+        raise ValueError(f"Unknown weights '{weights}', choose 'uniform' or 'distance'")
+
+    votes = np.zeros((labels.shape[0], n_classes))
+    np.add.at(votes, (np.arange(labels.shape[0])[:, None], labels), vote_weights)
+    return np.argmax(votes, axis=1)
+
+
+def _cross_fold_batch(X, X_T, squared_norms: np.ndarray, folds: np.ndarray, rows: slice,
+                      k: int, metric: str) -> Tuple[np.ndarray, np.ndarray]:
+    product = X[rows] @ X_T
+    product = product.toarray() if sp.issparse(product) else np.array(product)
+    if metric == 'cosine':
+        distances = 1 - product
+    else:
+        distances = np.sqrt(np.maximum(
+            0, squared_norms[rows][:, None] + squared_norms[None, :] - 2 * product
+        ))
+    # Baris dari fold yang sama adalah data uji satu sama lain, bukan tetangga
+    distances[folds[rows][:, None] == folds[None, :]] = np.inf
+    negative_distances, indices = CosineKNNClassifier._top_k(-distances, k)
+    return -negative_distances, indices
+
+
+def cross_fold_neighbors(X, folds: np.ndarray, max_k: int, metric: str = 'cosine',
+                         n_jobs: Optional[int] = None,
+                         max_batch_elements: int = 2 ** 24) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Untuk setiap baris, max_k tetangga terdekat (metric 'cosine' atau 'euclidean')
+    di antara baris pada fold lain. Jarak dihitung sekali untuk semua fold (batch
+    baris dikerjakan paralel), sehingga semua kandidat k/weights bisa dievaluasi
+    dari hasil yang sama. Mengembalikan (jarak, indeks) terurut dari yang terdekat.
+    """
+    if metric not in ('cosine', 'euclidean'):
+        raise ValueError(f"Unsupported metric '{metric}', choose 'cosine' or 'euclidean'")
+    if not sp.issparse(X):
+        X = np.asarray(X, dtype=np.float32)
+    if metric == 'cosine':
+        X = normalize(X)
+    if sp.issparse(X):
+        X = X.tocsr()
+        X_T = X.T.tocsr()
+        squared_norms = np.asarray(X.multiply(X).sum(axis=1)).ravel()
+    else:
+        X_T = X.T
+        squared_norms = np.einsum('ij,ij->i', X, X)
+
+    batch_size = max(1, max_batch_elements // max(1, X.shape[0]))
+    batches = [slice(start, start + batch_size) for start in range(0, X.shape[0], batch_size)]
+    results = Parallel(n_jobs=n_jobs, prefer='threads')(
+        delayed(_cross_fold_batch)(X, X_T, squared_norms, folds, rows, max_k, metric) for rows in batches
+    )
+    return np.vstack([r[0] for r in results]), np.vstack([r[1] for r in results])
@@ -0,0 +1,414 @@
+import logging
+import threading
+import time
+import numpy as np
+import pandas as pd
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from config.settings import Settings
+from core.instrumentation import metrics
+from core.crawling import YouTubeCrawler
+from core.preprocessing import TextPreprocessor
+from core.modeling import SentimentClassifier
+from database.connection import DatabaseManager
+
+# progress_callback(jumlah_diproses, total)
+ProgressCallback = Callable[[int, int], None]
+
+# Nama watermark ingest data training di tabel ingest_watermark
+TRAINING_WATERMARK = 'preprocessed_training'
+
+# Menambah jumlah (label asli, label prediksi) per video di sentiment_summary
+SUMMARY_UPSERT_QUERY = """
+    INSERT INTO sentiment_summary (video_id, true_sentiment, predict_sentiment, total)
+    VALUES (%s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE total = total + VALUES(total)
+"""
+
+# Menghitung ulang sentiment_summary sebuah video dari prediksi dan label terkini
+SUMMARY_DELETE_QUERY = "DELETE FROM sentiment_summary WHERE video_id = %s"
+SUMMARY_REBUILD_QUERY = """
+    INSERT INTO sentiment_summary (video_id, true_sentiment, predict_sentiment, total)
+    SELECT p.video_id, COALESCE(c.sentiment, ''), p.predict_sentiment, COUNT(*)
+    FROM predicted_sentiment p
+    LEFT JOIN youtube_comments c ON p.comment_id = c.comment_id
+    WHERE p.video_id = %s AND p.predict_sentiment IS NOT NULL
+    GROUP BY p.video_id, COALESCE(c.sentiment, ''), p.predict_sentiment
+"""
+
+# Pelatihan diserialisasi per proses: job yang berjalan bersamaan menunggu model
+# pertama selesai lalu memuat artefaknya, bukan melatih ulang. Keamanan file artefak
+# antar proses (app dan worker cli.py) dijaga oleh kunci file di SentimentClassifier.
+_MODEL_LOCK = threading.Lock()
+
+# comment_id unik: prediksi komentar yang sudah disimpan job lain dilewati
+PREDICTION_INSERT_QUERY = """
+    INSERT IGNORE INTO predicted_sentiment 
+    (predict_sentiment, comment_id, video_id) 
+    VALUES (%s, %s, %s)
+"""
+
+
+class SentimentPipeline:
+    """
+    Pipeline streaming: fetch per chunk -> preprocessing -> prediksi -> bulk insert.
+    Memori yang dipakai dibatasi oleh ukuran chunk (dan batch prediksi), bukan
+    jumlah komentar video.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, preprocessor: TextPreprocessor,
+                 classifier: SentimentClassifier, chunk_size: int = Settings.PIPELINE_CHUNK_SIZE,
+                 crawler: Optional[YouTubeCrawler] = None,
+                 predict_batch_size: int = Settings.PREDICT_BATCH_SIZE):
+        self.db_manager = db_manager
+        self.crawler = crawler
+        self.preprocessor = preprocessor
+        self.classifier = classifier
+        self.chunk_size = chunk_size
+        self.predict_batch_size = predict_batch_size
+        self.logger = logging.getLogger(__name__)
+
+    def crawl_video(self, video_id: str, progress_callback: Optional[ProgressCallback] = None) -> Optional[Dict]:
+        """
+        Menyimpan detail video lalu komentar barunya (per halaman, agar crawling yang
+        terputus bisa dilanjutkan). None jika video tidak ditemukan. Total komentar
+        belum diketahui saat crawling, jadi progress dilaporkan dengan total 0.
+        """
+        video_details = self.crawler.get_video_details(video_id)
+        if not video_details:
+            return None
+
+        title, thumbnail_url = video_details
+        self.db_manager.execute_query("""
+            INSERT INTO youtube_video (video_id, title, thumbnail_url)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE title=%s, thumbnail_url=%s
+        """, (video_id, title, thumbnail_url, title, thumbnail_url))
+
+        insert_comments_query = """
+            INSERT INTO youtube_comments
+            (youtube_comment_id, parent_id, video_id, comment, sender, published_at)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE comment = VALUES(comment)
+        """
+        new_comments = 0
+        for page in self.crawler.iter_comment_pages(video_id):
+            new_comments += self.db_manager.execute_many(insert_comments_query, [
+                (c['comment_id'], c['parent_id'], c['video_id'],
+                 c['comment'], c['sender'], c['published_at'])
+                for c in page
+            ])
+            if progress_callback:
+                progress_callback(new_comments, 0)
+
+        self.logger.info(f"Crawled {new_comments} new comments for video {video_id}")
+        return {'title': title, 'thumbnail_url': thumbnail_url, 'new_comments': new_comments}
+
+    def _training_watermark(self) -> int:
+        data = self.db_manager.fetch_data(
+            "SELECT last_id FROM ingest_watermark WHERE name = %s", (TRAINING_WATERMARK,)
+        )
+        return int(data['last_id'].iloc[0]) if not data.empty else 0
+
+    def count_new_training(self) -> int:
+        """
+        Jumlah baris training yang belum dipreprocessing (id di atas watermark)
+        """
+        return int(self.db_manager.fetch_data(
+            "SELECT COUNT(*) AS total FROM training WHERE id > %s", (self._training_watermark(),)
+        )['total'].iloc[0])
+
+    def ingest_new_training(self, progress_callback: Optional[ProgressCallback] = None) -> int:
+        """
+        Preprocessing hanya baris training baru lalu menambahkannya ke preprocessed_training.
+        Setiap chunk disimpan bersama watermark-nya dalam satu transaksi.
+        """
+        watermark = self._training_watermark()
+        total = self.count_new_training()
+        processed = 0
+
+        chunks = self.db_manager.iter_chunks("""
+            SELECT id, comment, sentiment FROM training
+            WHERE id > %s
+            ORDER BY id
+        """, (watermark,), chunk_size=self.chunk_size)
+
+        for chunk in chunks:
+            preprocessed = self.preprocessor.preprocess_series(chunk['comment'])
+            with self.db_manager.transaction() as cursor:
+                cursor.executemany(
+                    "INSERT INTO preprocessed_training (text, sentiment) VALUES (%s, %s)",
+                    list(zip(preprocessed, chunk['sentiment'].tolist()))
+                )
+                cursor.execute("""
+                    INSERT INTO ingest_watermark (name, last_id) VALUES (%s, %s)
+                    ON DUPLICATE KEY UPDATE last_id = VALUES(last_id)
+                """, (TRAINING_WATERMARK, int(chunk['id'].max())))
+
+            processed += len(chunk)
+            if progress_callback:
+                progress_callback(processed, total)
+
+        metrics.count('pipeline.ingested_training_rows', processed)
+        self.logger.info(f"Ingested {processed} new training rows")
+        return processed
+
+    def load_or_train_model(self) -> Dict:
+        """
+        Memakai artefak model tersimpan jika data training tidak berubah. Jika hanya
+        ada baris baru, model terakhir diperbarui secara inkremental; selain itu
+        model dilatih ulang. Artefak baru lalu disimpan.
+        """
+        with _MODEL_LOCK:
+            return self._load_or_train_model()
+
+    def _load_or_train_model(self) -> Dict:
+        training_data = self.db_manager.fetch_data(
+            "SELECT id, text, sentiment FROM preprocessed_training ORDER BY id"
+        )
+        fingerprint = self.classifier.fingerprint(training_data['text'], training_data['sentiment'])
+
+        model_result = self.classifier.load(Settings.MODEL_DIR, fingerprint)
+        if model_result is not None:
+            return model_result
+
+        model_result = self._update_model(training_data)
+        if model_result is None:
+            # Akurasi dan report dari split 80/20; model yang disimpan dan dipakai
+            # prediksi lalu dilatih ulang pada seluruh data training
+            model_result = self.classifier.train(training_data['text'], training_data['sentiment'])
+            self.classifier.fit(training_data['text'], training_data['sentiment'])
+
+        last_id = int(training_data['id'].max()) if not training_data.empty else None
+        self.classifier.save(Settings.MODEL_DIR, fingerprint, model_result, last_id=last_id)
+        return model_result
+
+    def _update_model(self, training_data) -> Optional[Dict]:
+        """
+        Menambahkan baris baru ke model terakhir. None jika harus dilatih ulang penuh
+        (belum ada model, data lama berubah, atau kosakata lama sudah tidak memadai).
+        """
+        previous = self.classifier.load_latest(Settings.MODEL_DIR)
+        if previous is None or previous.get('last_id') is None:
+            return None
+
+        known = training_data[training_data['id'] <= previous['last_id']]
+        if self.classifier.fingerprint(known['text'], known['sentiment']) != previous['fingerprint']:
+            return None
+
+        new_rows = training_data[training_data['id'] > previous['last_id']]
+        self.classifier.partial_fit(new_rows['text'], new_rows['sentiment'])
+        if self.classifier.needs_rebuild:
+            self.logger.info("Incremental rows exceed rebuild ratio, retraining model")
+            return None
+
+        self.logger.info(f"Model updated incrementally with {len(new_rows)} rows")
+        return {**previous, 'incremental_rows': self.classifier.appended_rows}
+
+    def preprocess_test_video(self, video_id: str, progress_callback: Optional[ProgressCallback] = None) -> int:
+        """
+        Preprocessing komentar sebuah video ke preprocessed_test, per chunk. Komentar
+        yang sudah diproses (baris preprocessed_test video ini, urut comment_id)
+        dilewati, sehingga proses yang terputus atau dibatalkan bisa dilanjutkan.
+        """
+        total = int(self.db_manager.fetch_data(
+            "SELECT COUNT(*) AS total FROM youtube_comments WHERE video_id = %s", (video_id,)
+        )['total'].iloc[0])
+        done = int(self.db_manager.fetch_data(
+            "SELECT COUNT(*) AS total FROM preprocessed_test WHERE video_id = %s", (video_id,)
+        )['total'].iloc[0])
+
+        processed = skipped = 0
+        chunks = self.db_manager.iter_chunks("""
+            SELECT comment, video_id FROM youtube_comments
+            WHERE video_id = %s
+            ORDER BY comment_id
+        """, (video_id,), chunk_size=self.chunk_size)
+
+        for chunk in chunks:
+            if skipped < done:
+                skip = min(done - skipped, len(chunk))
+                skipped += skip
+                chunk = chunk.iloc[skip:]
+                if chunk.empty:
+                    continue
+
+            preprocessed = self.preprocessor.preprocess_series(chunk['comment'])
+            self.db_manager.execute_many(
+                "INSERT INTO preprocessed_test (text, video_id) VALUES (%s, %s)",
+                zip(preprocessed, chunk['video_id'].tolist())
+            )
+
+            processed += len(chunk)
+            if progress_callback:
+                progress_callback(done + processed, total)
+
+        self.logger.info(f"Preprocessed {processed} test comments for video {video_id}")
+        return processed
+
+    def _save_predictions(self, chunk, predictions):
+        """
+        Menyimpan prediksi satu chunk beserta ringkasan per video dalam satu transaksi.
+        Jika sebagian komentar sudah diprediksi job lain yang berjalan bersamaan,
+        ringkasan video di chunk ini dihitung ulang dari baris yang benar-benar ada.
+        """
+        rows = [
+            (str(prediction), comment_id, video_id)
+            for prediction, comment_id, video_id
+            in zip(predictions, chunk['comment_id'].tolist(), chunk['video_id'].tolist())
+        ]
+        with self.db_manager.transaction() as cursor:
+            cursor.executemany(PREDICTION_INSERT_QUERY, rows)
+            if cursor.rowcount < len(rows):
+                for video_id in dict.fromkeys(chunk['video_id'].tolist()):
+                    cursor.execute(SUMMARY_DELETE_QUERY, (video_id,))
+                    cursor.execute(SUMMARY_REBUILD_QUERY, (video_id,))
+                return
+
+            summary = Counter(
+                (video_id, true_sentiment if isinstance(true_sentiment, str) else '', str(prediction))
+                for video_id, true_sentiment, prediction
+                in zip(chunk['video_id'].tolist(), chunk['sentiment'].tolist(), predictions)
+            )
+            cursor.executemany(SUMMARY_UPSERT_QUERY, [
+                (*key, total) for key, total in summary.items()
+            ])
+
+    def _score_batches(self, chunks: Iterable[pd.DataFrame], n_jobs: int) -> Iterator[Tuple[pd.DataFrame, np.ndarray]]:
+        """
+        Menggabungkan chunk fetch menjadi batch predict_batch_size baris sehingga
+        preprocessing dan KNN berjalan sekali per batch (cukup besar untuk dibagi ke
+        n_jobs thread), lalu mengembalikan prediksi per chunk asal untuk disimpan
+        """
+        def score(batch):
+            frame = pd.concat(batch, ignore_index=True)
+            predictions = self.classifier.predict(
+                self.preprocessor.preprocess_series(frame['comment']), n_jobs=n_jobs
+            )
+            offset = 0
+            for chunk in batch:
+                yield chunk, predictions[offset:offset + len(chunk)]
+                offset += len(chunk)
+
+        batch, rows = [], 0
+        for chunk in chunks:
+            batch.append(chunk)
+            rows += len(chunk)
+            if rows >= self.predict_batch_size:
+                yield from score(batch)
+                batch, rows = [], 0
+        if batch:
+            yield from score(batch)
+
+    def predict_videos(self, video_ids: List[str], progress_callback: Optional[ProgressCallback] = None,
+                       n_jobs: int = Settings.PREDICT_JOBS) -> Dict[str, Dict]:
+        """
+        Prediksi banyak video sekaligus untuk laporan tingkat channel. Komentar yang
+        belum punya prediksi diambil dengan satu query, lalu setiap batch
+        predict_batch_size komentar (lintas video) divektorisasi sekali dan pencarian
+        KNN dibagi ke n_jobs thread. Prediksi disimpan per chunk fetch. Komentar yang
+        sudah diprediksi dilewati, jadi aman dijalankan ulang. Model harus sudah dimuat.
+        """
+        video_ids = list(dict.fromkeys(video_ids))
+        results = {video_id: {'processed': 0, 'counts': Counter()} for video_id in video_ids}
+        if not video_ids:
+            return {}
+
+        placeholders = ', '.join(['%s'] * len(video_ids))
+        unscored = f"""
+            FROM youtube_comments c
+            LEFT JOIN predicted_sentiment p ON p.comment_id = c.comment_id
+            WHERE c.video_id IN ({placeholders}) AND p.comment_id IS NULL
+        """
+        total = int(self.db_manager.fetch_data(
+            f"SELECT COUNT(*) AS total {unscored}", tuple(video_ids)
+        )['total'].iloc[0])
+
+        started = time.perf_counter()
+        processed = 0
+        # Diurutkan per video sehingga baris setiap video ditulis berkelompok
+        chunks = self.db_manager.iter_chunks(f"""
+            SELECT c.comment_id, c.comment, c.video_id, c.sentiment {unscored}
+            ORDER BY c.video_id, c.comment_id
+        """, tuple(video_ids), chunk_size=self.chunk_size)
+
+        for chunk, predictions in self._score_batches(chunks, n_jobs):
+            self._save_predictions(chunk, predictions)
+
+            for video_id, prediction in zip(chunk['video_id'].tolist(), predictions):
+                # Kolasi video_id case-insensitive, jadi id dari database bisa berbeda huruf
+                result = results.setdefault(video_id, {'processed': 0, 'counts': Counter()})
+                result['processed'] += 1
+                result['counts'][str(prediction)] += 1
+
+            processed += len(chunk)
+            if progress_callback:
+                progress_callback(processed, total)
+
+        metrics.record('pipeline.predict_videos', time.perf_counter() - started, processed)
+        self.logger.info(f"Predicted {processed} comments across {len(video_ids)} videos")
+        return {
+            video_id: {'processed': result['processed'], 'counts': dict(result['counts'])}
+            for video_id, result in results.items()
+        }
+
+    def update_labels(self, labels: List[Tuple[str, int]]) -> int:
+        """
+        Menyimpan label manual (sentiment, comment_id). Ringkasan video yang
+        komentarnya sudah diprediksi dihitung ulang dalam transaksi yang sama,
+        sehingga confusion matrix dan akurasi mengikuti label terbaru.
+        """
+        labels = list(labels)
+        if not labels:
+            return 0
+
+        with self.db_manager.transaction() as cursor:
+            video_ids = set()
+            for start in range(0, len(labels), Settings.DB_CHUNK_SIZE):
+                chunk = labels[start:start + Settings.DB_CHUNK_SIZE]
+                cursor.executemany(
+                    "UPDATE youtube_comments SET sentiment = %s WHERE comment_id = %s", chunk
+                )
+                cursor.execute(
+                    f"""SELECT DISTINCT video_id FROM youtube_comments
+                        WHERE comment_id IN ({', '.join(['%s'] * len(chunk))})""",
+                    tuple(comment_id for _, comment_id in chunk)
+                )
+                video_ids.update(row[0] for row in cursor.fetchall())
+
+            for video_id in video_ids:
+                cursor.execute(SUMMARY_DELETE_QUERY, (video_id,))
+                cursor.execute(SUMMARY_REBUILD_QUERY, (video_id,))
+
+        self.logger.info(f"Updated {len(labels)} labels, refreshed summary of {len(video_ids)} videos")
+        return len(labels)
+
+    def video_summary(self, video_id: str) -> Dict:
+        """
+        Ringkasan prediksi sebuah video dari sentiment_summary: jumlah per kelas
+        prediksi, confusion matrix (komentar berlabel saja) dan akurasinya.
+        Ukurannya tetap kecil berapa pun jumlah komentarnya.
+        """
+        summary = self.db_manager.fetch_data("""
+            SELECT true_sentiment, predict_sentiment, total FROM sentiment_summary
+            WHERE video_id = %s
+        """, (video_id,), ttl=Settings.QUERY_CACHE_TTL)
+
+        counts = summary.groupby('predict_sentiment')['total'].sum().sort_values(ascending=False)
+        labelled = summary[summary['true_sentiment'] != '']
+        confusion = labelled.pivot_table(
+            index='true_sentiment', columns='predict_sentiment',
+            values='total', aggfunc='sum', fill_value=0
+        )
+        labelled_total = int(labelled['total'].sum())
+        correct = int(labelled.loc[
+            labelled['true_sentiment'] == labelled['predict_sentiment'], 'total'
+        ].sum())
+
+        return {
+            'total': int(counts.sum()),
+            'counts': counts,
+            'confusion': confusion,
+            'labelled': labelled_total,
+            'accuracy': correct / labelled_total if labelled_total else None
+        }
@@ -1,51 +1,233 @@
+import os
 import re
-import pandas as pd
-from typing import List
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, FrozenSet, List, Optional, Tuple
 import logging
-from nltk.corpus import stopwords
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+import pandas as pd
+from Sastrawi.Dictionary.ArrayDictionary import ArrayDictionary
+from config.settings import Settings
+from core.instrumentation import metrics
+from core.resources import get_slang_dict, get_slang_trie, get_stemmer, get_stopwords, resource_digest
+from core.slang import SlangTrie
+
+# Pola pembersihan dikompilasi sekali; urutan penerapannya tetap sama
+URL_PATTERN = re.compile(r'http\S+')
+MENTION_HASHTAG_PATTERN = re.compile(r'(@\w+|#\w+)')
+HTML_PATTERN = re.compile('<.*?>')
+NON_ALPHA_PATTERN = re.compile(r'[^a-zA-Z\s]')
+CLEAN_PATTERNS = (URL_PATTERN, MENTION_HASHTAG_PATTERN, HTML_PATTERN, NON_ALPHA_PATTERN)
+
+# Normalisasi yang dilakukan Sastrawi sebelum memecah teks menjadi kata
+STEM_NORMALIZE_PATTERN = re.compile(r'[^a-z0-9 -]')
+
+# Naikkan jika logika clean_text berubah agar cache hasil preprocessing tidak dipakai lagi
+PREPROCESSOR_VERSION = 2
+
+
+class SetDictionary(ArrayDictionary):
+    """Kamus kata dasar Sastrawi dengan lookup O(1) (bawaan memakai list)"""
+
+    def __init__(self, words=None):
+        super().__init__()
+        self.words = set()
+        if words:
+            self.add_words(words)
+
+    def add(self, word):
+        if not word or word.strip() == '':
+            return
+        self.words.add(word)
+
+
+class StemCache:
+    """Cache LRU hasil stemming per kata, bisa disimpan ke disk"""
+
+    def __init__(self, max_size: int = 100000, path: Optional[str] = None, track_new: bool = False):
+        """
+        track_new: catat entri baru agar bisa diambil dengan drain_new (dipakai worker
+        process untuk mengirim stem baru kembali ke proses utama)
+        """
+        self.max_size = max_size
+        self.path = path
+        self.track_new = track_new
+        self._data: 'OrderedDict[str, str]' = OrderedDict()
+        self._new: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, word: str) -> Optional[str]:
+        with self._lock:
+            stem = self._data.get(word)
+            if stem is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(word)
+            self.hits += 1
+            return stem
+
+    def set(self, word: str, stem: str):
+        with self._lock:
+            self._data[word] = stem
+            self._data.move_to_end(word)
+            if len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+            if self.track_new:
+                self._new[word] = stem
+            self._dirty = True
+
+    def drain_new(self) -> Dict[str, str]:
+        """Mengambil lalu mengosongkan entri yang ditambahkan sejak drain terakhir"""
+        with self._lock:
+            entries, self._new = self._new, {}
+        return entries
+
+    def merge(self, entries: Dict[str, str]):
+        """Menambahkan entri dari cache lain (mis. hasil worker process)"""
+        for word, stem in entries.items():
+            self.set(word, stem)
+
+    def load(self) -> int:
+        """Memuat cache dari disk, mengembalikan jumlah entri yang dimuat"""
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        with open(self.path, 'rb') as f:
+            entries: Dict[str, str] = pickle.load(f)
+        with self._lock:
+            for word, stem in entries.items():
+                self._data[word] = stem
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+        return len(entries)
+
+    def save(self):
+        """Menyimpan cache ke disk jika ada perubahan"""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            entries = dict(self._data)
+            self._dirty = False
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp-{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+
+class PreprocessCache:
+    """
+    Cache persisten hasil clean_text di tabel preprocess_cache, dipakai bersama oleh
+    alur training, data test dan prediksi. Kunci = sha256(versi preprocessor + isi
+    resource + teks mentah), jadi perubahan logika atau kamus otomatis membuat kunci baru.
+    """
+
+    def __init__(self, db_manager, batch_size: int = 500):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.logger = logging.getLogger(__name__)
+        self._version = None
+
+    def key(self, text: str) -> str:
+        if self._version is None:
+            self._version = f"{PREPROCESSOR_VERSION}:{resource_digest()}"
+        return hashlib.sha256(f"{self._version}\0{text}".encode('utf-8')).hexdigest()
+
+    def get_many(self, texts: List[str]) -> Dict[str, str]:
+        """
+        Hasil yang sudah tersimpan, {teks mentah: teks bersih}; {} jika gagal
+        """
+        keys = {self.key(text): text for text in texts}
+        found = {}
+        try:
+            key_list = list(keys)
+            for start in range(0, len(key_list), self.batch_size):
+                batch = key_list[start:start + self.batch_size]
+                data = self.db_manager.fetch_data(
+                    f"SELECT text_hash, cleaned FROM preprocess_cache "
+                    f"WHERE text_hash IN ({', '.join([self.db_manager.placeholder] * len(batch))})",
+                    tuple(batch)
+                )
+                for text_hash, cleaned in zip(data['text_hash'], data['cleaned']):
+                    found[keys[text_hash]] = cleaned if isinstance(cleaned, str) else ''
+        except Exception as e:
+            self.logger.error(f"Error reading preprocess cache: {e}")
+            return {}
+        return found
+
+    def put_many(self, results: Dict[str, str]):
+        # Cache hanya optimasi: gagal menyimpan tidak menggagalkan preprocessing
+        placeholder = self.db_manager.placeholder
+        try:
+            self.db_manager.execute_many(f"""
+                INSERT INTO preprocess_cache (text_hash, cleaned) VALUES ({placeholder}, {placeholder})
+                ON DUPLICATE KEY UPDATE cleaned = VALUES(cleaned)
+            """, [(self.key(text), cleaned) for text, cleaned in results.items()])
+        except Exception as e:
+            self.logger.error(f"Error writing preprocess cache: {e}")
+
 
 class TextPreprocessor:
-    def __init__(self):
-        # Inisialisasi stemmer dan stopwords
-        factory = StemmerFactory()
-        self.stemmer = factory.create_stemmer()
-        
-        # Load stopwords
-        self.stopwords = self._load_stopwords()
-        
-        # Load slang dict
-        self.slang_dict = self._load_slang_dictionaries()
-        
+    def __init__(self, stem_cache_size: int = Settings.STEM_CACHE_SIZE,
+                 stem_cache_path: Optional[str] = Settings.STEM_CACHE_PATH,
+                 result_cache: Optional[PreprocessCache] = None):
         self.logger = logging.getLogger(__name__)
 
-    def _load_stopwords(self) -> set:
+        # Cache hasil preprocessing per teks (opsional, butuh database)
+        self.result_cache = result_cache
+
+        # Stemmer, stopwords dan kamus slang dimuat saat pertama dipakai
+        # (sekali per proses, lihat core.resources)
+
+        # Cache stemming per kata; disimpan ke disk lewat save_stem_cache
+        self.stem_cache = StemCache(max_size=stem_cache_size, path=stem_cache_path)
         try:
-            nltk_stopwords = set(stopwords.words('indonesian'))
-            file_stopwords = set(pd.read_csv(
-                'resources/stopwords.txt', 
-                header=None
-            )[0])
-            return nltk_stopwords.union(file_stopwords)
+            self.stem_cache.load()
         except Exception as e:
-            self.logger.error(f"Error loading stopwords: {e}")
-            return set()
+            self.logger.error(f"Error loading stem cache: {e}")
 
-    def _load_slang_dictionaries(self) -> dict:
+    def save_stem_cache(self):
+        """
+        Menyimpan cache stemming ke disk jika berubah. Dipanggil sekali di akhir
+        run/job dan saat layanan berhenti, bukan setiap preprocess_texts.
+        """
         try:
-            # Load the slang dictionary
-            dict_1 = pd.read_csv('resources/slang-words.csv').set_index('kataAlay')
-            
-            dict_2 = pd.read_csv('resources/colloquial-indonesian-lexicon.csv')
-            dict_2 = dict_2.filter(['slang', 'formal'], axis=1).drop_duplicates(subset=['slang'], keep='first')
-            dict_2 = dict_2.set_index('slang')
-            
-            # Combine both dictionaries
-            slang_dict_combined = pd.concat([dict_1['kataBaik'], dict_2['formal']])
-            return slang_dict_combined.to_dict()
+            self.stem_cache.save()
         except Exception as e:
-            self.logger.error(f"Error loading slang dictionaries: {e}")
-            return {}
+            self.logger.error(f"Error saving stem cache: {e}")
+
+    @property
+    def stemmer(self):
+        return get_stemmer()
+
+    @property
+    def stopwords(self) -> FrozenSet[str]:
+        return get_stopwords()
+
+    @property
+    def slang_dict(self) -> Dict[str, str]:
+        return get_slang_dict()
+
+    @property
+    def slang_trie(self) -> SlangTrie:
+        return get_slang_trie()
+
+    def _stem_word(self, word: str) -> str:
+        stem = self.stem_cache.get(word)
+        if stem is None:
+            stem = self.stemmer.stem_word(word)
+            self.stem_cache.set(word, stem)
+        return stem
 
     def clean_text(self, text: str) -> str:
         if not isinstance(text, str):
@@ -53,25 +235,134 @@ class TextPreprocessor:
 
         # Proses pembersihan teks
         text = text.lower()
-        text = re.sub(r'http\S+', '', text)  # Hapus URL
-        text = re.sub(r'(@\w+|#\w+)', '', text)  # Hapus mention dan hashtag
-        text = re.sub('<.*?>', '', text)  # Hapus HTML
-        text = re.sub(r'[^a-zA-Z\s]', '', text)  # Hanya huruf dan spasi
+        text = URL_PATTERN.sub('', text)  # Hapus URL
+        text = MENTION_HASHTAG_PATTERN.sub('', text)  # Hapus mention dan hashtag
+        text = HTML_PATTERN.sub('', text)  # Hapus HTML
+        text = NON_ALPHA_PATTERN.sub('', text)  # Hanya huruf dan spasi
 
-        # Normalisasi kata slang
+        # Normalisasi kata dan frasa slang
         words = text.split()
-        normalized_words = [self.slang_dict.get(word, word) for word in words]
+        normalized_words = self.slang_trie.normalize(words)
         
-        # Stemming
-        stemmed_text = self.stemmer.stem(' '.join(normalized_words))
+        # Stemming per kata (hasil kamus slang bisa berisi beberapa kata atau tanda baca)
+        normalized_text = STEM_NORMALIZE_PATTERN.sub(' ', ' '.join(normalized_words).lower())
+        stemmed_words = [self._stem_word(word) for word in normalized_text.split()]
         
         # Hapus stopwords
+        stopword_set = self.stopwords
         final_words = [
-            word for word in stemmed_text.split() 
-            if word not in self.stopwords and len(word) > 1
+            word for word in stemmed_words
+            if word not in stopword_set and len(word) > 1
         ]
 
         return ' '.join(final_words)
 
-    def preprocess_texts(self, texts: List[str]) -> List[str]:
-        return [self.clean_text(text) for text in texts]
\ No newline at end of file
+    def _stem_filter(self, normalized: str, stopword_set: FrozenSet[str]) -> str:
+        """
+        Stemming dan penghapusan stopword untuk satu kata/frasa hasil normalisasi
+        slang; bisa menghasilkan beberapa kata atau string kosong
+        """
+        return ' '.join(
+            stem for stem in map(self._stem_word, STEM_NORMALIZE_PATTERN.sub(' ', normalized.lower()).split())
+            if stem not in stopword_set and len(stem) > 1
+        )
+
+    def _clean_batch(self, texts: List[str]) -> List[str]:
+        """
+        Versi batch dari clean_text dengan hasil identik. Regex dijalankan per kolom
+        dengan operasi .str pandas, slang dinormalisasi dengan satu pemindaian trie
+        per komentar, lalu stemming dan stopword dihitung sekali per kata unik di
+        batch dan diterapkan lewat tabel lookup.
+        """
+        cleaned = pd.Series(texts, dtype=object).str.lower()
+        for pattern in CLEAN_PATTERNS:
+            cleaned = cleaned.str.replace(pattern, '', regex=True)
+
+        normalize = self.slang_trie.normalize
+        word_lists = [normalize(words) for words in cleaned.str.split().tolist()]
+
+        stopword_set = self.stopwords
+        table = {
+            word: self._stem_filter(word, stopword_set)
+            for word in set(chain.from_iterable(word_lists))
+        }
+        metrics.count('preprocess.unique_tokens', len(table))
+
+        return [' '.join(filter(None, map(table.__getitem__, words))) for words in word_lists]
+
+    def preprocess_series(self, texts: pd.Series, n_jobs: int = Settings.PREPROCESS_JOBS,
+                          batch_size: int = 500) -> pd.Series:
+        """
+        Preprocessing satu kolom teks; hasilnya Series dengan index yang sama
+        """
+        texts = pd.Series(texts, dtype=object)
+        return pd.Series(
+            self.preprocess_texts(texts.tolist(), n_jobs=n_jobs, batch_size=batch_size),
+            index=texts.index, dtype=object
+        )
+
+    def preprocess_texts(self, texts: List[str], n_jobs: int = Settings.PREPROCESS_JOBS,
+                         batch_size: int = 500) -> List[str]:
+        """
+        Preprocessing banyak teks. Teks duplikat dan yang sudah ada di result_cache
+        tidak diproses ulang. Dengan n_jobs > 1 (atau -1 untuk semua core) batch teks
+        dikerjakan paralel di process pool dengan hasil yang sama.
+        """
+        # clean_text memperlakukan non-string sebagai teks kosong
+        texts = [text if isinstance(text, str) else '' for text in texts]
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+
+        with metrics.timer('preprocess.texts', rows=len(texts)):
+            # Teks identik (spam, komentar duplikat) cukup diproses sekali
+            unique_texts = list(dict.fromkeys(texts))
+            cleaned = self.result_cache.get_many(unique_texts) if self.result_cache else {}
+            pending = [text for text in unique_texts if text not in cleaned]
+            metrics.count('preprocess.duplicate_texts', len(texts) - len(unique_texts))
+            metrics.count('preprocess.result_cache_hits', len(unique_texts) - len(pending))
+
+            if n_jobs <= 1 or len(pending) <= batch_size:
+                pending_results = self._clean_batch(pending)
+            else:
+                batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+                with ProcessPoolExecutor(
+                    max_workers=n_jobs,
+                    initializer=_init_worker,
+                    initargs=(self.stem_cache.max_size, self.stem_cache.path)
+                ) as executor:
+                    pending_results = []
+                    for batch_results, new_stems in executor.map(_preprocess_batch, batches):
+                        pending_results.extend(batch_results)
+                        self.stem_cache.merge(new_stems)
+
+            new_results = dict(zip(pending, pending_results))
+            if self.result_cache and new_results:
+                self.result_cache.put_many(new_results)
+            cleaned.update(new_results)
+            results = [cleaned[text] for text in texts]
+
+        metrics.gauge('preprocess.stem_cache_size', len(self.stem_cache))
+        metrics.gauge('preprocess.stem_cache_hits', self.stem_cache.hits)
+        metrics.gauge('preprocess.stem_cache_misses', self.stem_cache.misses)
+
+        return results
+
+
+# Preprocessor milik setiap worker process, dibuat sekali oleh initializer
+_worker_preprocessor: Optional[TextPreprocessor] = None
+
+
+def _init_worker(stem_cache_size: int, stem_cache_path: Optional[str]):
+    # Worker hanya membaca cache; stem baru dikirim kembali bersama hasil batch
+    # dan disimpan oleh proses utama
+    global _worker_preprocessor
+    _worker_preprocessor = TextPreprocessor(
+        stem_cache_size=stem_cache_size,
+        stem_cache_path=stem_cache_path
+    )
+    _worker_preprocessor.stem_cache.track_new = True
+
+
+def _preprocess_batch(texts: List[str]) -> Tuple[List[str], Dict[str, str]]:
+    results = _worker_preprocessor._clean_batch(texts)
+    return results, _worker_preprocessor.stem_cache.drain_new()
@@ -0,0 +1,163 @@
+import os
+import json
+import pickle
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple
+from config.settings import Settings
+from core.slang import SlangTrie
+
+# Naikkan jika format atau isi hasil kompilasi berubah
+RESOURCE_FORMAT_VERSION = 3
+
+RESOURCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resources')
+STOPWORDS_PATH = os.path.join(RESOURCE_DIR, 'stopwords.txt')
+SLANG_WORDS_PATH = os.path.join(RESOURCE_DIR, 'slang-words.csv')
+COLLOQUIAL_LEXICON_PATH = os.path.join(RESOURCE_DIR, 'colloquial-indonesian-lexicon.csv')
+
+logger = logging.getLogger(__name__)
+
+
+def _root_words_path() -> str:
+    import Sastrawi
+    return os.path.join(os.path.dirname(Sastrawi.__file__), 'Stemmer', 'data', 'kata-dasar.txt')
+
+
+def _signature() -> Tuple:
+    """
+    Versi format + (path, mtime, ukuran) setiap file sumber; hasil kompilasi
+    dibuat ulang jika salah satunya berubah
+    """
+    files = []
+    for path in (STOPWORDS_PATH, SLANG_WORDS_PATH, COLLOQUIAL_LEXICON_PATH, _root_words_path()):
+        try:
+            stat = os.stat(path)
+            files.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            files.append((path, None, None))
+    return (RESOURCE_FORMAT_VERSION, tuple(files))
+
+
+def _compile_stopwords() -> FrozenSet[str]:
+    # nltk lambat di-import (~1 detik), jadi hanya dimuat saat kompilasi ulang
+    from nltk.corpus import stopwords
+    import pandas as pd
+
+    nltk_stopwords = set(stopwords.words('indonesian'))
+    file_stopwords = set(pd.read_csv(STOPWORDS_PATH, header=None)[0])
+    return frozenset(nltk_stopwords.union(file_stopwords))
+
+
+def _compile_slang_dict() -> Dict[str, str]:
+    import pandas as pd
+
+    # Entri tanpa bentuk baku (kolom kosong) diabaikan; nilainya NaN dan tidak bisa digabung ke teks
+    dict_1 = pd.read_csv(SLANG_WORDS_PATH).dropna(subset=['kataBaik']).set_index('kataAlay')
+
+    dict_2 = pd.read_csv(COLLOQUIAL_LEXICON_PATH)
+    dict_2 = dict_2.filter(['slang', 'formal'], axis=1).drop_duplicates(subset=['slang'], keep='first')
+    dict_2 = dict_2.dropna(subset=['formal']).set_index('slang')
+
+    # Gabungkan kedua kamus (entri kamus kedua menimpa yang pertama)
+    return pd.concat([dict_1['kataBaik'], dict_2['formal']]).to_dict()
+
+
+def _compile_root_words() -> List[str]:
+    with open(_root_words_path(), 'r') as f:
+        return [word for word in f.read().split('\n') if word.strip()]
+
+
+def compile_resources() -> Tuple[Dict, bool]:
+    """
+    Membaca semua file sumber. Mengembalikan (resources, lengkap); resource yang
+    gagal dimuat diganti kosong seperti sebelumnya dan hasilnya tidak disimpan.
+    """
+    resources = {}
+    complete = True
+    for name, compile_fn, empty in (
+        ('stopwords', _compile_stopwords, frozenset()),
+        ('slang_dict', _compile_slang_dict, {}),
+        ('root_words', _compile_root_words, [])
+    ):
+        try:
+            resources[name] = compile_fn()
+        except Exception as e:
+            logger.error(f"Error loading {name}: {e}")
+            resources[name] = empty
+            complete = False
+    resources['slang_trie'] = SlangTrie.build(resources['slang_dict'])
+    return resources, complete
+
+
+@lru_cache(maxsize=None)
+def get_resources() -> Dict:
+    """
+    Resource bahasa untuk preprocessing, dimuat sekali per proses. Hasil kompilasi
+    disimpan di Settings.RESOURCE_CACHE_PATH sehingga start berikutnya cukup satu
+    pickle.load tanpa pandas/nltk.
+    """
+    path = Settings.RESOURCE_CACHE_PATH
+    signature = _signature()
+
+    if path and os.path.exists(path):
+        try:
+            with open(path, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('signature') == signature:
+                return cached['resources']
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable resource cache {path}: {e}")
+
+    resources, complete = compile_resources()
+    if path and complete:
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{path}.tmp-{os.getpid()}"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'signature': signature, 'resources': resources}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Error saving resource cache: {e}")
+    return resources
+
+
+@lru_cache(maxsize=None)
+def resource_digest() -> str:
+    """
+    Hash isi resource (urutan stabil), untuk kunci cache hasil preprocessing
+    """
+    resources = get_resources()
+    content = json.dumps([
+        sorted(map(str, resources['stopwords'])),
+        sorted((str(k), str(v)) for k, v in resources['slang_dict'].items()),
+        sorted(resources['root_words'])
+    ], ensure_ascii=False)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def get_stopwords() -> FrozenSet[str]:
+    return get_resources()['stopwords']
+
+
+def get_slang_dict() -> Dict[str, str]:
+    return get_resources()['slang_dict']
+
+
+def get_slang_trie() -> SlangTrie:
+    return get_resources()['slang_trie']
+
+
+@lru_cache(maxsize=None)
+def get_stemmer():
+    """
+    Stemmer Sastrawi dengan kamus kata dasar berbasis set, dipakai bersama oleh
+    semua TextPreprocessor dalam satu proses
+    """
+    from Sastrawi.Stemmer.Stemmer import Stemmer
+    from core.preprocessing import SetDictionary
+
+    return Stemmer(SetDictionary(get_resources()['root_words']))
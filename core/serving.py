@@ -0,0 +1,332 @@
+import os
+import json
+import time
+import queue
+import signal
+import socket
+import logging
+import threading
+import multiprocessing
+import urllib.request
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+from config.settings import Settings
+from core.instrumentation import metrics
+from core.modeling import SentimentClassifier
+from core.preprocessing import TextPreprocessor
+
+logger = logging.getLogger(__name__)
+
+# Contoh komentar untuk load_test jika tidak ada file teks
+SAMPLE_TEXTS = (
+    "videonya bagus banget, sangat bermanfaat",
+    "kontennya jelek dan membosankan",
+    "mantap bang lanjutkan",
+    "gak jelas banget isinya",
+    "terima kasih informasinya sangat membantu",
+    "biasa aja sih menurut saya",
+)
+
+
+class LatencyStats:
+    """
+    Latensi per request (jendela N request terakhir) dan throughput sejak start
+    """
+
+    def __init__(self, window: int = 10000):
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self.batched_texts = 0
+
+    def record(self, seconds: float, texts: int):
+        with self._lock:
+            self._latencies.append(seconds)
+            self.requests += 1
+            self.texts += texts
+
+    def record_batch(self, size: int):
+        with self._lock:
+            self.batches += 1
+            self.batched_texts += size
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            latencies = np.fromiter(self._latencies, dtype=float)
+            uptime = time.monotonic() - self.started
+            return {
+                'pid': os.getpid(),
+                'requests': self.requests,
+                'texts': self.texts,
+                'uptime_seconds': round(uptime, 3),
+                'throughput_rps': round(self.requests / uptime, 2) if uptime else 0.0,
+                'throughput_texts_per_second': round(self.texts / uptime, 2) if uptime else 0.0,
+                'p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 3) if len(latencies) else None,
+                'p99_ms': round(float(np.percentile(latencies, 99)) * 1000, 3) if len(latencies) else None,
+                'batches': self.batches,
+                'mean_batch_size': round(self.batched_texts / self.batches, 2) if self.batches else None
+            }
+
+
+class _Pending:
+    __slots__ = ('texts', 'future')
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.future = Future()
+
+
+class MicroBatcher:
+    """
+    Menggabungkan request yang datang bersamaan menjadi satu batch prediksi.
+    Batch dijalankan saat berisi max_batch_size teks atau max_wait detik sejak
+    request pertama, sehingga vektorisasi dan KNN berjalan sekali per batch.
+    """
+
+    def __init__(self, predict_fn: Callable[[List[str]], List[str]],
+                 max_batch_size: int = Settings.SERVE_MAX_BATCH,
+                 max_wait: float = Settings.SERVE_MAX_WAIT_MS / 1000,
+                 stats: Optional[LatencyStats] = None):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.stats = stats
+        self._queue: 'queue.Queue[Optional[_Pending]]' = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+
+    def start(self) -> 'MicroBatcher':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def submit(self, texts: List[str]) -> Future:
+        pending = _Pending(texts)
+        self._queue.put(pending)
+        return pending.future
+
+    def _collect(self, first: _Pending) -> List[_Pending]:
+        batch, size = [first], len(first.texts)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pending = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if pending is None:
+                # Sinyal berhenti: selesaikan batch ini dulu
+                self._queue.put(None)
+                break
+            batch.append(pending)
+            size += len(pending.texts)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            texts = [text for pending in batch for text in pending.texts]
+            try:
+                with metrics.timer('serving.batch', rows=len(texts)):
+                    predictions = self.predict_fn(texts)
+            except Exception as e:
+                logger.error(f"Prediction batch failed: {e}")
+                for pending in batch:
+                    pending.future.set_exception(e)
+                continue
+
+            if self.stats:
+                self.stats.record_batch(len(texts))
+            offset = 0
+            for pending in batch:
+                pending.future.set_result(predictions[offset:offset + len(pending.texts)])
+                offset += len(pending.texts)
+
+
+def make_predict_fn(classifier: SentimentClassifier,
+                    preprocessor: TextPreprocessor) -> Callable[[List[str]], List[str]]:
+    def predict(texts: List[str]) -> List[str]:
+        cleaned = preprocessor.preprocess_texts(texts, n_jobs=1)
+        return [str(prediction) for prediction in classifier.predict(pd.Series(cleaned, dtype=object))]
+    return predict
+
+
+def make_handler(batcher: MicroBatcher, stats: LatencyStats, timeout: float = Settings.SERVE_TIMEOUT):
+    class PredictionHandler(BaseHTTPRequestHandler):
+        """
+        POST /predict  {"text": "..."} atau {"texts": ["...", ...]}
+        GET  /stats    latensi p50/p99 dan throughput worker ini
+        GET  /metrics  metrik format Prometheus
+        GET  /health
+        """
+        protocol_version = 'HTTP/1.1'
+
+        def _send(self, status: int, body, content_type: str = 'application/json'):
+            payload = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send(200, {'status': 'ok'})
+            elif self.path == '/stats':
+                self._send(200, stats.snapshot())
+            elif self.path == '/metrics':
+                self._send(200, metrics.to_prometheus().encode('utf-8'), 'text/plain; version=0.0.4')
+            else:
+                self._send(404, {'error': 'not found'})
+
+        def do_POST(self):
+            if self.path != '/predict':
+                self._send(404, {'error': 'not found'})
+                return
+
+            start = time.perf_counter()
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                if not isinstance(body, dict):
+                    raise ValueError("body harus berupa objek JSON")
+                single = 'text' in body
+                texts = [body['text']] if single else body.get('texts')
+                if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                    raise ValueError("body harus berisi 'text' (string) atau 'texts' (list string)")
+            except (ValueError, TypeError) as e:
+                self._send(400, {'error': str(e)})
+                return
+
+            try:
+                predictions = batcher.submit(texts).result(timeout=timeout) if texts else []
+            except Exception as e:
+                self._send(500, {'error': str(e)})
+                return
+
+            stats.record(time.perf_counter() - start, len(texts))
+            self._send(200, {'prediction': predictions[0]} if single else {'predictions': predictions})
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return PredictionHandler
+
+
+def _serve_worker(sock: socket.socket, classifier: SentimentClassifier, preprocessor: TextPreprocessor,
+                  max_batch_size: int, max_wait: float):
+    stats = LatencyStats()
+    batcher = MicroBatcher(make_predict_fn(classifier, preprocessor), max_batch_size, max_wait, stats).start()
+
+    # Socket listening dibuat (dan diwarisi) dari proses induk; kernel membagi koneksi antar worker
+    server = ThreadingHTTPServer(sock.getsockname()[:2], make_handler(batcher, stats), bind_and_activate=False)
+    server.socket.close()
+    server.socket = sock
+    server.daemon_threads = True
+    logger.info(f"Prediction worker {os.getpid()} listening on {sock.getsockname()[:2]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Ctrl+C diterima seluruh process group; abaikan sinyal berikutnya selama batch terakhir selesai
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        server.server_close()
+        batcher.stop()
+        preprocessor.save_stem_cache()
+
+
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(classifier: SentimentClassifier, preprocessor: TextPreprocessor,
+          host: str = Settings.SERVE_HOST, port: int = Settings.SERVE_PORT,
+          workers: int = Settings.SERVE_WORKERS, max_batch_size: int = Settings.SERVE_MAX_BATCH,
+          max_wait_ms: float = Settings.SERVE_MAX_WAIT_MS):
+    """
+    Menjalankan layanan prediksi HTTP. Model dan resource preprocessing dimuat
+    sekali di proses induk sebelum fork, sehingga semua worker berbagi memori
+    yang sama (matriks training memory-mapped dan halaman copy-on-write).
+    """
+    # Muat resource lazy sekarang agar tidak dimuat ulang di setiap worker
+    preprocessor.clean_text("warmup")
+
+    sock = socket.create_server((host, port), backlog=1024)
+    max_wait = max_wait_ms / 1000
+
+    if workers <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        _serve_worker(sock, classifier, preprocessor, max_batch_size, max_wait)
+        return
+
+    context = multiprocessing.get_context('fork')
+    processes = [
+        context.Process(target=_serve_worker, args=(sock, classifier, preprocessor, max_batch_size, max_wait))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    # SIGTERM ke proses induk (mis. dari supervisor) menghentikan semua worker
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGINT)
+        for process in processes:
+            process.join(timeout=5)
+    finally:
+        sock.close()
+
+
+def load_test(url: str, texts: List[str], requests: int = 1000, concurrency: int = 16,
+              batch_size: int = 1) -> Dict:
+    """
+    Mengirim request paralel ke /predict dan mengukur latensi end-to-end di sisi
+    klien (p50/p99) serta throughput gabungan semua worker
+    """
+    endpoint = url.rstrip('/') + '/predict'
+
+    def send(i: int) -> float:
+        chunk = [texts[(i * batch_size + j) % len(texts)] for j in range(batch_size)]
+        body = {'text': chunk[0]} if batch_size == 1 else {'texts': chunk}
+        request = urllib.request.Request(
+            endpoint, data=json.dumps(body).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}
+        )
+        start = time.perf_counter()
+        with urllib.request.urlopen(request) as response:
+            response.read()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = np.fromiter(executor.map(send, range(requests)), dtype=float)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'batch_size': batch_size,
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(requests / elapsed, 2),
+        'throughput_texts_per_second': round(requests * batch_size / elapsed, 2),
+        'p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 3),
+        'p99_ms': round(float(np.percentile(latencies, 99)) * 1000, 3)
+    }
@@ -0,0 +1,98 @@
+from typing import Dict, List, Optional, Tuple
+
+# Simpul trie: (bentuk baku jika urutan kata sampai simpul ini ada di kamus, anak per kata berikutnya)
+Node = Tuple[Optional[str], Optional[Dict[str, 'Node']]]
+
+
+class SlangTrie:
+    """
+    Kamus slang yang dikompilasi menjadi trie per kata, sehingga entri beberapa kata
+    ("gak papa", "mon maap") ikut dinormalisasi. Teks dipindai sekali dari kiri ke
+    kanan dan di setiap posisi diambil entri terpanjang yang cocok.
+    """
+    __slots__ = ('root', 'max_words', 'words', 'phrase_starts')
+
+    def __init__(self, root: Dict[str, Node], max_words: int):
+        self.root = root
+        self.max_words = max_words
+        # Entri satu kata sebagai dict biasa dan kata awal frasa: komentar tanpa kata
+        # awal frasa (hampir semuanya) cukup diproses dengan lookup dict
+        self.words = {word: value for word, (value, _) in root.items() if value is not None}
+        self.phrase_starts = frozenset(word for word, (_, children) in root.items() if children)
+
+    @classmethod
+    def build(cls, slang_dict: Dict[str, str]) -> 'SlangTrie':
+        # Kunci dinormalisasi menjadi kata-kata tanpa spasi berlebih; kunci yang sudah
+        # dalam bentuk normal dimasukkan terakhir sehingga menang jika bentrok
+        entries = sorted(
+            ((key == ' '.join(key.split()), key.split(), value)
+             for key, value in slang_dict.items() if key.split()),
+            key=lambda entry: entry[0]
+        )
+
+        root: Dict = {}
+        max_words = 0
+        for _, words, value in entries:
+            children = root
+            for word in words[:-1]:
+                node = children.setdefault(word, [None, {}])
+                if node[1] is None:
+                    node[1] = {}
+                children = node[1]
+            children.setdefault(words[-1], [None, None])[0] = value
+            max_words = max(max_words, len(words))
+        return cls(cls._freeze(root), max_words)
+
+    @classmethod
+    def _freeze(cls, children: Dict) -> Dict[str, Node]:
+        return {
+            word: (value, cls._freeze(grandchildren) if grandchildren else None)
+            for word, (value, grandchildren) in children.items()
+        }
+
+    def __len__(self) -> int:
+        return self._count(self.root)
+
+    def _count(self, children: Dict[str, Node]) -> int:
+        return sum(
+            (value is not None) + (self._count(grandchildren) if grandchildren else 0)
+            for value, grandchildren in children.values()
+        )
+
+    def _match(self, words: List[str], start: int) -> Tuple[Optional[str], int]:
+        """
+        Entri terpanjang yang dimulai di posisi start: (bentuk baku atau None, posisi setelahnya)
+        """
+        value, children = self.root[words[start]]
+        match, end = value, start + 1
+        j, n = start + 1, len(words)
+        while children is not None and j < n:
+            node = children.get(words[j])
+            if node is None:
+                break
+            value, children = node
+            j += 1
+            if value is not None:
+                match, end = value, j
+        return match, end
+
+    def normalize(self, words: List[str]) -> List[str]:
+        """
+        Mengganti kata/frasa slang dengan bentuk bakunya; kata lain tidak berubah
+        """
+        single = self.words
+        phrase_starts = self.phrase_starts
+        if phrase_starts.isdisjoint(words):
+            return [single.get(word, word) for word in words]
+
+        # Frasa hanya bisa dimulai di kata awal frasa; kata di antaranya cukup lookup dict
+        normalized = []
+        i = 0
+        for position in [j for j, word in enumerate(words) if word in phrase_starts]:
+            if position < i:
+                continue
+            normalized.extend([single.get(word, word) for word in words[i:position]])
+            match, i = self._match(words, position)
+            normalized.append(words[position] if match is None else match)
+        normalized.extend([single.get(word, word) for word in words[i:]])
+        return normalized
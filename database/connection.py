@@ -1,10 +1,33 @@
 import mysql.connector
 import pandas as pd
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from config.settings import Settings
+from database.pool import ConnectionPool
+from core.instrumentation import metrics
+
+# Table/column names are interpolated into paginated queries, so only plain identifiers pass
+IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+# MySQL client errors for a dropped connection (server gone away / lost during
+# query); only these are retried on a fresh connection
+STALE_ERRNOS = frozenset({2006, 2013, 2055})
 
 class DatabaseManager:
-    def __init__(self):
+    def __init__(self, connection_factory: Optional[Callable[[], Any]] = None,
+                 driver=mysql.connector, pool_size: int = None, pool_timeout: float = None,
+                 stale_errnos: Iterable[int] = STALE_ERRNOS):
+        """
+        ``driver`` is the DB-API module behind ``connection_factory`` (used for its
+        ``Error`` hierarchy and ``paramstyle``), so the manager can run against e.g.
+        sqlite3 in tests. Errors whose ``errno`` is in ``stale_errnos`` mean a dead
+        connection and are retried on a fresh one (up to ``DB_MAX_RETRIES`` times).
+        """
         self.config = {
             'host': Settings.DB_HOST,
             'user': Settings.DB_USER,
@@ -13,34 +36,268 @@ class DatabaseManager:
             'charset': 'utf8mb4'
         }
         self.logger = logging.getLogger(__name__)
+        self.driver = driver
+        self.stale_errnos = frozenset(stale_errnos)
+        # Placeholder for the queries built by the helpers below (fetch_page, count_rows, ...)
+        self.placeholder = '?' if getattr(driver, 'paramstyle', 'pyformat') == 'qmark' else '%s'
+        self.max_retries = Settings.DB_MAX_RETRIES
+        self.pool = ConnectionPool(
+            connection_factory or self._connect,
+            size=pool_size or Settings.DB_POOL_SIZE,
+            timeout=pool_timeout or Settings.DB_POOL_TIMEOUT,
+            ping_interval=Settings.DB_POOL_PING_INTERVAL
+        )
+        # Cached fetch_data results: (query, params) -> (fetched_at, DataFrame).
+        # Any write through this manager bumps the generation and clears the cache.
+        self._query_cache: 'OrderedDict[Tuple, Tuple[float, pd.DataFrame]]' = OrderedDict()
+        self._cache_generation = 0
+        self._cache_lock = threading.Lock()
+        self.query_cache_size = Settings.QUERY_CACHE_SIZE
+        pool = self.pool
+        metrics.register_collector('db.pool', lambda: {
+            f"db.pool.{key}": value for key, value in pool.stats().items()
+        })
 
-    def get_connection(self):
-        """Manually manage connection without using context manager"""
+    def _connect(self):
         try:
-            connection = mysql.connector.connect(**self.config)
-            return connection
-        except mysql.connector.Error as err:
+            return self.driver.connect(**self.config)
+        except self.driver.Error as err:
             self.logger.error(f"Database connection error: {err}")
             raise
 
+    def pool_stats(self) -> dict:
+        """Pool usage: open/in-use/idle connections, waits and checkout latency."""
+        return self.pool.stats()
+
+    def invalidate_cache(self):
+        """Drop all cached query results (called after every write)."""
+        with self._cache_lock:
+            self._cache_generation += 1
+            self._query_cache.clear()
+
+    def _is_stale(self, error: BaseException) -> bool:
+        """True for disconnects; bad SQL or missing tables are not worth a retry."""
+        return isinstance(error, self.driver.Error) and getattr(error, 'errno', None) in self.stale_errnos
+
+    def _run(self, work: Callable[[Any], Any]):
+        """Run ``work(connection)`` on a pooled connection, retrying on stale connections."""
+        for attempt in range(self.max_retries + 1):
+            connection = self.pool.acquire()
+            try:
+                result = work(connection)
+            except BaseException as err:
+                if self._is_stale(err):
+                    self.pool.release(connection, discard=True)
+                    if attempt == self.max_retries:
+                        raise
+                    self.logger.warning(f"Retrying on fresh connection after: {err}")
+                    continue
+                try:
+                    connection.rollback()  # Rollback in case of error
+                except Exception:
+                    self.pool.release(connection, discard=True)
+                    raise
+                self.pool.release(connection)
+                raise
+            self.pool.release(connection)
+            return result
+
     def execute_query(self, query: str, params: tuple = None):
         """Execute a SQL query with provided parameters."""
-        connection = self.get_connection()
+        def work(connection):
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query, params or ())
+                connection.commit()
+            finally:
+                cursor.close()  # Ensure the cursor is closed
+
         try:
+            with metrics.timer('db.execute'):
+                self._run(work)
+        except self.driver.Error as err:
+            metrics.count('db.errors')
+            self.logger.error(f"Query execution error: {err}")
+        finally:
+            self.invalidate_cache()
+
+    def execute_many(self, query: str, params_list: Iterable[tuple], chunk_size: int = None) -> int:
+        """Execute a statement for many parameter sets in a single transaction.
+
+        Rows are sent with ``executemany`` in chunks of ``chunk_size``; for INSERTs
+        mysql.connector rewrites each chunk into one multi-row VALUES statement.
+        Returns the number of rows written. On error the transaction is rolled back
+        and the error is re-raised, so callers never mistake a lost write for success.
+        """
+        params_list = list(params_list)
+        if not params_list:
+            return 0
+
+        chunk_size = chunk_size or Settings.DB_CHUNK_SIZE
+
+        def work(connection):
             cursor = connection.cursor()
-            cursor.execute(query, params or ())
+            try:
+                for start in range(0, len(params_list), chunk_size):
+                    cursor.executemany(query, params_list[start:start + chunk_size])
+                connection.commit()
+            finally:
+                cursor.close()
+            return len(params_list)
+
+        try:
+            with metrics.timer('db.execute_many', rows=len(params_list)):
+                return self._run(work)
+        except self.driver.Error as err:
+            metrics.count('db.errors')
+            self.logger.error(f"Bulk query execution error: {err}")
+            raise
+        finally:
+            self.invalidate_cache()
+
+    @contextmanager
+    def transaction(self):
+        """Run several statements atomically: ``with db.transaction() as cursor: ...``.
+
+        Commits when the block exits normally and rolls back on any exception.
+        Unlike the other helpers it is not retried on stale connections.
+        """
+        connection = self.pool.acquire()
+        cursor = connection.cursor()
+        discard = False
+        try:
+            yield cursor
             connection.commit()
-        except mysql.connector.Error as err:
-            self.logger.error(f"Query execution error: {err}")
-            connection.rollback()  # Rollback in case of error
+        except BaseException:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+            raise
         finally:
-            cursor.close()  # Ensure the cursor is closed
-            connection.close()  # Ensure the connection is closed
+            cursor.close()
+            self.pool.release(connection, discard=discard)
+            self.invalidate_cache()
+
+    def fetch_data(self, query: str, params: tuple = None, ttl: float = None) -> pd.DataFrame:
+        """Fetch data from the database and return it as a DataFrame.
+
+        With ``ttl`` (seconds) the result is cached per (query, params) until it
+        expires or any write goes through this manager. Writes made by other
+        processes are only picked up once the TTL runs out.
+        """
+        key = (query, tuple(params) if params is not None else None)
+        if ttl:
+            with self._cache_lock:
+                entry = self._query_cache.get(key)
+                generation = self._cache_generation
+                if entry is not None and time.monotonic() - entry[0] < ttl:
+                    self._query_cache.move_to_end(key)
+                    metrics.count('db.cache_hits')
+                    return entry[1].copy()
+
+        def work(connection):
+            data = pd.read_sql(query, connection, params=params)
+            # End the read transaction so the pooled connection doesn't keep an old snapshot
+            connection.commit()
+            return data
+
+        with metrics.timer('db.fetch'):
+            data = self._run(work)
+        metrics.count('db.fetched_rows', len(data))
+
+        if ttl:
+            with self._cache_lock:
+                # Skip storing if a write happened while this query was running
+                if generation == self._cache_generation:
+                    self._query_cache[key] = (time.monotonic(), data.copy())
+                    self._query_cache.move_to_end(key)
+                    while len(self._query_cache) > self.query_cache_size:
+                        self._query_cache.popitem(last=False)
+        return data
+
+    def iter_chunks(self, query: str, params: tuple = None, chunk_size: int = None) -> Iterator[pd.DataFrame]:
+        """Stream a result set as DataFrame chunks through an unbuffered (server-side) cursor.
 
-    def fetch_data(self, query: str, params: tuple = None) -> pd.DataFrame:
-        """Fetch data from the database and return it as a DataFrame."""
-        connection = self.get_connection()
+        The connection stays checked out until the generator is exhausted or closed,
+        so don't run it with a pool of size 1 while writing from the same manager.
+        """
+        chunk_size = chunk_size or Settings.DB_CHUNK_SIZE
+        connection = self.pool.acquire()
+        completed = False
         try:
-            return pd.read_sql(query, connection, params=params)
+            cursor = connection.cursor()
+            cursor.execute(query, params or ())
+            columns = [column[0] for column in cursor.description]
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield pd.DataFrame(rows, columns=columns)
+            cursor.close()
+            connection.commit()
+            completed = True
         finally:
-            connection.close()  # Ensure the connection is closed after fetching
+            # A half-read unbuffered result can't be reused safely, so drop that connection
+            self.pool.release(connection, discard=not completed)
+
+    @staticmethod
+    def _identifier(name: str) -> str:
+        if not IDENTIFIER_PATTERN.match(name):
+            raise ValueError(f"Invalid SQL identifier: {name!r}")
+        return name
+
+    def _where(self, equals: Optional[Dict[str, Any]] = None,
+               contains: Optional[Dict[str, str]] = None) -> Tuple[List[str], List[Any]]:
+        """Build WHERE conditions: ``equals`` ({column: value}, None means IS NULL)
+        and case-insensitive substring search ``contains`` ({column: text})."""
+        conditions, params = [], []
+        for column, value in (equals or {}).items():
+            if value is None:
+                conditions.append(f"{self._identifier(column)} IS NULL")
+            else:
+                conditions.append(f"{self._identifier(column)} = {self.placeholder}")
+                params.append(value)
+        for column, text in (contains or {}).items():
+            if not text:
+                continue
+            escaped = text.replace('!', '!!').replace('%', '!%').replace('_', '!_')
+            conditions.append(f"LOWER({self._identifier(column)}) LIKE {self.placeholder} ESCAPE '!'")
+            params.append(f"%{escaped.lower()}%")
+        return conditions, params
+
+    def fetch_page(self, table: str, columns: Iterable[str], key: str = 'id', after: Any = None,
+                   page_size: int = None, equals: Optional[Dict[str, Any]] = None,
+                   contains: Optional[Dict[str, str]] = None, ttl: float = None) -> pd.DataFrame:
+        """Fetch one page of ``table`` ordered by the unique column ``key``.
+
+        Keyset pagination: pass the last ``key`` value of the previous page as
+        ``after``. Unlike OFFSET, each page is an index range scan, so the cost
+        stays bounded by ``page_size`` however deep the page is.
+        """
+        page_size = page_size or Settings.PAGE_SIZE
+        key = self._identifier(key)
+        selected = [self._identifier(column) for column in columns]
+        if key not in selected:
+            selected.insert(0, key)
+
+        conditions, params = self._where(equals, contains)
+        if after is not None:
+            conditions.append(f"{key} > {self.placeholder}")
+            params.append(after)
+
+        query = f"SELECT {', '.join(selected)} FROM {self._identifier(table)}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {key} LIMIT {self.placeholder}"
+        params.append(int(page_size))
+        return self.fetch_data(query, tuple(params), ttl=ttl)
+
+    def count_rows(self, table: str, equals: Optional[Dict[str, Any]] = None,
+                   contains: Optional[Dict[str, str]] = None, ttl: float = None) -> int:
+        """Count the rows matching the same filters as ``fetch_page``."""
+        conditions, params = self._where(equals, contains)
+        query = f"SELECT COUNT(*) AS total FROM {self._identifier(table)}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        return int(self.fetch_data(query, tuple(params), ttl=ttl)['total'].iloc[0])
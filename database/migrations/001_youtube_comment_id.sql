@@ -0,0 +1,8 @@
+-- Jalankan setelah mengimpor sentiment_analysis.sql.
+-- Menyimpan ID komentar asli YouTube agar crawling ulang / inkremental tidak menduplikasi data.
+
+ALTER TABLE `youtube_comments`
+  ADD COLUMN `youtube_comment_id` varchar(64) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NULL DEFAULT NULL,
+  ADD COLUMN `parent_id` varchar(64) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NULL DEFAULT NULL,
+  ADD COLUMN `published_at` varchar(32) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NULL DEFAULT NULL,
+  ADD UNIQUE INDEX `youtube_comment_id`(`youtube_comment_id` ASC) USING BTREE;
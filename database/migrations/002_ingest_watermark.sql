@@ -0,0 +1,14 @@
+-- Watermark id data training yang sudah dipreprocessing, untuk ingest inkremental.
+-- Jika preprocessed_training sudah terisi (dari sentiment_analysis.sql), seluruh isi
+-- tabel training dianggap sudah diproses.
+
+CREATE TABLE IF NOT EXISTS `ingest_watermark`  (
+  `name` varchar(64) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL,
+  `last_id` int NOT NULL DEFAULT 0,
+  PRIMARY KEY (`name`) USING BTREE
+) ENGINE = InnoDB CHARACTER SET = utf8mb4 COLLATE = utf8mb4_unicode_ci ROW_FORMAT = Dynamic;
+
+INSERT IGNORE INTO `ingest_watermark` (`name`, `last_id`)
+SELECT 'preprocessed_training',
+       IF(EXISTS (SELECT 1 FROM `preprocessed_training`), COALESCE(MAX(`id`), 0), 0)
+FROM `training`;
@@ -0,0 +1,19 @@
+-- Antrian job untuk worker CLI (python cli.py worker). UI menambahkan job dan
+-- membaca status/progress-nya, worker mengambil job dengan status 'queued'.
+
+CREATE TABLE IF NOT EXISTS `jobs`  (
+  `id` int NOT NULL AUTO_INCREMENT,
+  `kind` varchar(32) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL,
+  `payload` text CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NULL,
+  `status` varchar(16) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL DEFAULT 'queued',
+  `worker` varchar(128) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NULL DEFAULT NULL,
+  `progress` int NOT NULL DEFAULT 0,
+  `total` int NOT NULL DEFAULT 0,
+  `result` text CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NULL,
+  `error` text CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NULL,
+  `created_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  `started_at` timestamp NULL DEFAULT NULL,
+  `finished_at` timestamp NULL DEFAULT NULL,
+  PRIMARY KEY (`id`) USING BTREE,
+  INDEX `idx_jobs_status`(`status`, `id`) USING BTREE
+) ENGINE = InnoDB CHARACTER SET = utf8mb4 COLLATE = utf8mb4_unicode_ci ROW_FORMAT = Dynamic;
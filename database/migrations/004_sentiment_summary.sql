@@ -0,0 +1,27 @@
+-- Ringkasan hasil prediksi per video untuk dashboard: jumlah komentar per pasangan
+-- (label asli, label prediksi). Distribusi prediksi, confusion matrix dan akurasi
+-- dihitung dari tabel kecil ini, bukan dari JOIN seluruh komentar video.
+-- Diperbarui oleh pipeline dalam transaksi yang sama dengan insert predicted_sentiment.
+
+-- comment_id merujuk youtube_comments.comment_id (int); sebelumnya varchar tanpa index
+ALTER TABLE `predicted_sentiment`
+  MODIFY COLUMN `comment_id` int NULL DEFAULT NULL,
+  ADD INDEX `comment_id`(`comment_id` ASC) USING BTREE;
+
+CREATE TABLE IF NOT EXISTS `sentiment_summary`  (
+  `video_id` varchar(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL,
+  -- Label asli komentar; '' jika komentar belum berlabel
+  `true_sentiment` varchar(16) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL DEFAULT '',
+  `predict_sentiment` varchar(16) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL,
+  `total` int NOT NULL DEFAULT 0,
+  PRIMARY KEY (`video_id`, `true_sentiment`, `predict_sentiment`) USING BTREE
+) ENGINE = InnoDB CHARACTER SET = utf8mb4 COLLATE = utf8mb4_unicode_ci ROW_FORMAT = Dynamic;
+
+-- Isi dari prediksi yang sudah ada
+INSERT INTO `sentiment_summary` (`video_id`, `true_sentiment`, `predict_sentiment`, `total`)
+SELECT p.`video_id`, COALESCE(c.`sentiment`, ''), p.`predict_sentiment`, COUNT(*)
+FROM `predicted_sentiment` p
+LEFT JOIN `youtube_comments` c ON p.`comment_id` = c.`comment_id`
+WHERE p.`video_id` IS NOT NULL AND p.`predict_sentiment` IS NOT NULL
+GROUP BY p.`video_id`, COALESCE(c.`sentiment`, ''), p.`predict_sentiment`
+ON DUPLICATE KEY UPDATE `total` = VALUES(`total`);
@@ -0,0 +1,10 @@
+-- Cache hasil preprocessing per teks komentar, dipakai bersama oleh data training,
+-- data test dan prediksi. text_hash = sha256(versi preprocessor + isi resource + teks),
+-- sehingga entri lama otomatis tidak terpakai saat logika atau kamus berubah.
+
+CREATE TABLE IF NOT EXISTS `preprocess_cache`  (
+  `text_hash` char(64) CHARACTER SET ascii COLLATE ascii_bin NOT NULL,
+  `cleaned` text CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL,
+  `created_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`text_hash`) USING BTREE
+) ENGINE = InnoDB CHARACTER SET = utf8mb4 COLLATE = utf8mb4_unicode_ci ROW_FORMAT = Dynamic;
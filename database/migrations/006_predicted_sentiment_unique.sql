@@ -0,0 +1,21 @@
+-- Satu prediksi per komentar. Job prediksi bisa berjalan bersamaan (aplikasi dan
+-- worker CLI, atau batch yang mencakup video yang sedang diprediksi); dengan index
+-- unik dan INSERT IGNORE komentar yang sama tidak tersimpan dan terhitung dua kali.
+
+-- Hapus duplikat lama, simpan prediksi pertama setiap komentar
+DELETE p FROM `predicted_sentiment` p
+JOIN `predicted_sentiment` q ON p.`comment_id` = q.`comment_id` AND p.`id` > q.`id`;
+
+ALTER TABLE `predicted_sentiment`
+  DROP INDEX `comment_id`,
+  ADD UNIQUE INDEX `comment_id`(`comment_id` ASC) USING BTREE;
+
+-- Hitung ulang ringkasan tanpa duplikat
+DELETE FROM `sentiment_summary`;
+
+INSERT INTO `sentiment_summary` (`video_id`, `true_sentiment`, `predict_sentiment`, `total`)
+SELECT p.`video_id`, COALESCE(c.`sentiment`, ''), p.`predict_sentiment`, COUNT(*)
+FROM `predicted_sentiment` p
+LEFT JOIN `youtube_comments` c ON p.`comment_id` = c.`comment_id`
+WHERE p.`video_id` IS NOT NULL AND p.`predict_sentiment` IS NOT NULL
+GROUP BY p.`video_id`, COALESCE(c.`sentiment`, ''), p.`predict_sentiment`;
@@ -0,0 +1,6 @@
+-- Waktu progress terakhir job yang berjalan. Worker CLI yang baru start menandai
+-- gagal job 'running' yang tidak memperbarui progress lebih lama dari
+-- JOB_STALE_TIMEOUT (worker-nya mati sebelum sempat menyelesaikan job).
+
+ALTER TABLE `jobs`
+  ADD COLUMN `updated_at` timestamp NULL DEFAULT NULL AFTER `started_at`;
@@ -0,0 +1,156 @@
+import time
+import threading
+import logging
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within the pool timeout."""
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of DB-API connections.
+
+    Works with any driver: ``connect`` is a zero-argument callable returning a
+    new connection. Idle connections are health-checked before being handed out
+    again and replaced transparently when they turn out to be stale.
+    """
+
+    def __init__(self, connect: Callable[[], Any], size: int = 5, timeout: float = 10.0,
+                 ping_interval: float = 30.0, health_check: Optional[Callable[[Any], bool]] = None):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self._health_check = health_check or self._default_health_check
+        self._idle = deque()  # (connection, released_at)
+        self._created = 0
+        self._lock = threading.Condition()
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'discarded': 0,
+            'checkout_time_total': 0.0,
+            'checkout_time_max': 0.0,
+        }
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _default_health_check(connection) -> bool:
+        """Ping the server; falls back to ``SELECT 1`` for drivers without ping."""
+        try:
+            if hasattr(connection, 'is_connected'):
+                return connection.is_connected()
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        """Check a connection out of the pool, blocking up to ``timeout`` seconds."""
+        started = time.perf_counter()
+        deadline = started + self.timeout
+        waited = False
+
+        while True:
+            connection = None
+            released_at = None
+            with self._lock:
+                while not self._idle and self._created >= self.size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"No database connection available after {self.timeout}s "
+                            f"(pool size {self.size})"
+                        )
+                    if not waited:
+                        self._stats['waits'] += 1
+                        waited = True
+                    self._lock.wait(remaining)
+
+                if self._idle:
+                    connection, released_at = self._idle.pop()
+                else:
+                    self._created += 1
+
+            if connection is None:
+                try:
+                    connection = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                        self._lock.notify()
+                    raise
+            elif (time.monotonic() - released_at >= self.ping_interval
+                    and not self._health_check(connection)):
+                # Stale idle connection: drop it and try again with a fresh one
+                self.logger.warning("Discarding stale database connection")
+                self._discard(connection)
+                continue
+
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._stats['checkouts'] += 1
+                self._stats['checkout_time_total'] += elapsed
+                self._stats['checkout_time_max'] = max(self._stats['checkout_time_max'], elapsed)
+            return connection
+
+    def _discard(self, connection):
+        self._close_quietly(connection)
+        with self._lock:
+            self._created -= 1
+            self._stats['discarded'] += 1
+            self._lock.notify()
+
+    def release(self, connection, discard: bool = False):
+        """Return a connection to the pool, or close it when ``discard`` is set."""
+        if discard:
+            self._discard(connection)
+            return
+        with self._lock:
+            self._idle.append((connection, time.monotonic()))
+            self._lock.notify()
+
+    def close_all(self):
+        """Close every idle connection."""
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._created -= len(idle)
+        for connection, _ in idle:
+            self._close_quietly(connection)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            checkouts = self._stats['checkouts']
+            return {
+                'size': self.size,
+                'open': self._created,
+                'idle': len(self._idle),
+                'in_use': self._created - len(self._idle),
+                'checkouts': checkouts,
+                'waits': self._stats['waits'],
+                'timeouts': self._stats['timeouts'],
+                'discarded': self._stats['discarded'],
+                'checkout_ms_avg': (
+                    self._stats['checkout_time_total'] / checkouts * 1000 if checkouts else 0.0
+                ),
+                'checkout_ms_max': self._stats['checkout_time_max'] * 1000,
+            }
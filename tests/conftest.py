@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modul repo di-import langsung (core.*, database.*), seperti saat menjalankan app.py/cli.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
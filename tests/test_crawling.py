@@ -0,0 +1,131 @@
+import pytest
+
+from core.crawling import YouTubeCrawler
+
+PAGE_SIZE = 10
+
+
+class StubRequest:
+    def __init__(self, response):
+        self.response = response
+
+    def execute(self):
+        return self.response
+
+
+def make_thread(comment_id, day, included_replies=0, total_replies=None):
+    published_at = f"2024-01-{day:02d}T00:00:00Z"
+    return {
+        'snippet': {
+            'topLevelComment': {
+                'id': comment_id,
+                'snippet': {'textDisplay': f"komentar {comment_id}", 'authorDisplayName': 'a', 'publishedAt': published_at}
+            },
+            'totalReplyCount': included_replies if total_replies is None else total_replies,
+        },
+        'replies': {'comments': [
+            {'id': f"{comment_id}.r{i}",
+             'snippet': {'textDisplay': 'balasan', 'authorDisplayName': 'b', 'publishedAt': published_at}}
+            for i in range(included_replies)
+        ]},
+    }
+
+
+class StubYouTube:
+    """commentThreads().list dan comments().list dengan paginasi ala API YouTube"""
+
+    def __init__(self, threads, replies=None):
+        self.threads = threads
+        self.replies = replies or {}
+        self.page_tokens = []
+
+    def commentThreads(self):
+        return self
+
+    def comments(self):
+        return StubReplies(self.replies)
+
+    def list(self, **params):
+        self.page_tokens.append(params.get('pageToken'))
+        start = int(params.get('pageToken') or 0)
+        response = {'items': self.threads[start:start + PAGE_SIZE]}
+        if start + PAGE_SIZE < len(self.threads):
+            response['nextPageToken'] = str(start + PAGE_SIZE)
+        return StubRequest(response)
+
+
+class StubReplies:
+    def __init__(self, replies):
+        self.replies = replies
+
+    def list(self, **params):
+        return StubRequest({'items': self.replies[params['parentId']]})
+
+
+@pytest.fixture
+def threads():
+    # Urutan 'time': komentar terbaru lebih dulu
+    return [make_thread(f"c{i:02d}", 28 - i) for i in range(25)]
+
+
+def make_crawler(client, state_dir):
+    return YouTubeCrawler(client_factory=lambda: client, state_dir=str(state_dir), requests_per_second=1000)
+
+
+def comment_ids(pages):
+    return [comment['comment_id'] for page in pages for comment in page]
+
+
+def test_interrupted_crawl_resumes_from_first_unprocessed_page(threads, tmp_path):
+    client = StubYouTube(threads)
+    pages = make_crawler(client, tmp_path).iter_comment_pages('video')
+    first = next(pages)
+    next(pages)  # halaman pertama selesai diproses, halaman kedua belum
+    pages.close()
+
+    assert comment_ids([first]) == [f"c{i:02d}" for i in range(10)]
+    state = make_crawler(client, tmp_path).state.load('video')
+    assert state['page_token'] == '10'
+
+    resumed = list(make_crawler(client, tmp_path).iter_comment_pages('video'))
+
+    assert comment_ids(resumed) == [f"c{i:02d}" for i in range(10, 25)]
+    assert client.page_tokens[-2:] == ['10', '20']
+    # Crawl selesai: checkpoint halaman dihapus, komentar terbaru dari run yang terputus dipakai
+    assert make_crawler(client, tmp_path).state.load('video') == {'newest_published_at': '2024-01-28T00:00:00Z'}
+
+
+def test_incremental_crawl_stops_at_known_comments(threads, tmp_path):
+    client = StubYouTube(threads)
+    assert len(comment_ids(make_crawler(client, tmp_path).iter_comment_pages('video'))) == 25
+
+    threads.insert(0, make_thread('baru', 29))
+    pages = list(make_crawler(client, tmp_path).iter_comment_pages('video'))
+
+    assert comment_ids(pages) == ['baru']
+    assert make_crawler(client, tmp_path).state.load('video') == {'newest_published_at': '2024-01-29T00:00:00Z'}
+
+
+def test_max_comments_checkpoints_remaining_pages(threads, tmp_path):
+    client = StubYouTube(threads)
+    first = list(make_crawler(client, tmp_path).iter_comment_pages('video', max_comments=10))
+    rest = list(make_crawler(client, tmp_path).iter_comment_pages('video'))
+
+    assert comment_ids(first + rest) == [f"c{i:02d}" for i in range(25)]
+
+
+def test_missing_replies_are_fetched_separately(tmp_path):
+    replies = {'c00': [
+        {'id': f"c00.x{i}", 'snippet': {'textDisplay': 'balasan', 'authorDisplayName': 'b',
+                                        'publishedAt': '2024-01-02T00:00:00Z'}}
+        for i in range(7)
+    ]}
+    client = StubYouTube([make_thread('c00', 1, included_replies=5, total_replies=7),
+                          make_thread('c01', 1, included_replies=1)], replies)
+
+    comments = [comment for page in make_crawler(client, tmp_path).iter_comment_pages('video') for comment in page]
+
+    assert [comment['comment_id'] for comment in comments] == (
+        ['c00'] + [f"c00.x{i}" for i in range(7)] + ['c01', 'c01.r0']
+    )
+    assert {comment['parent_id'] for comment in comments[1:8]} == {'c00'}
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from sklearn.neighbors import KNeighborsClassifier
+
+from core.neighbors import CosineKNNClassifier, LSHKNNClassifier, neighbor_recall
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = sp.random(60, 40, density=0.2, format='csr', random_state=1, dtype=np.float64)
+    # Setiap baris punya minimal satu fitur agar cosine terdefinisi
+    X = (X + sp.csr_matrix((np.ones(60), (np.arange(60), rng.integers(0, 40, 60))), shape=(60, 40))).tocsr()
+    y = rng.choice(['negatif', 'netral', 'positif'], size=60)
+    return X[:45], y[:45], X[45:]
+
+
+def brute_force(X_train, y_train, k):
+    return KNeighborsClassifier(n_neighbors=k, metric='cosine', algorithm='brute').fit(X_train, y_train)
+
+
+@pytest.mark.parametrize('k', [1, 3, 5])
+def test_cosine_knn_matches_sklearn_brute_force(data, k):
+    X_train, y_train, X_query = data
+    expected = brute_force(X_train, y_train, k)
+    model = CosineKNNClassifier(n_neighbors=k).fit(X_train, y_train)
+
+    distances, indices = model.kneighbors(X_query)
+    expected_distances, expected_indices = expected.kneighbors(X_query)
+
+    np.testing.assert_array_equal(indices, expected_indices)
+    np.testing.assert_allclose(distances, expected_distances, atol=1e-6)
+    np.testing.assert_array_equal(model.predict(X_query), expected.predict(X_query))
+
+
+def test_cosine_knn_batching_and_dense_input_give_same_neighbours(data):
+    X_train, y_train, X_query = data
+    expected = brute_force(X_train, y_train, 5).kneighbors(X_query, return_distance=False)
+
+    # Batch satu query per perkalian matriks
+    batched = CosineKNNClassifier(n_neighbors=5, max_batch_elements=1).fit(X_train, y_train)
+    dense = CosineKNNClassifier(n_neighbors=5).fit(X_train.toarray(), y_train)
+
+    np.testing.assert_array_equal(batched.kneighbors(X_query, return_distance=False), expected)
+    np.testing.assert_array_equal(dense.kneighbors(X_query.toarray(), return_distance=False), expected)
+
+
+def test_lsh_with_single_bucket_is_exact(data):
+    X_train, y_train, X_query = data
+    exact = CosineKNNClassifier(n_neighbors=5).fit(X_train, y_train)
+    # Tanpa bit hash semua data masuk satu bucket sehingga kandidatnya lengkap
+    lsh = LSHKNNClassifier(n_neighbors=5, n_tables=1, n_bits=0).fit(X_train, y_train)
+
+    assert neighbor_recall(lsh, exact, X_query) == 1.0
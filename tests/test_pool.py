@@ -0,0 +1,163 @@
+import sqlite3
+import threading
+
+import pytest
+
+from database.connection import DatabaseManager
+from database.pool import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def counting_factory():
+    created = []
+
+    def connect():
+        connection = FakeConnection(len(created))
+        created.append(connection)
+        return connection
+    return connect, created
+
+
+def test_released_connection_is_reused():
+    connect, created = counting_factory()
+    pool = ConnectionPool(connect, size=2)
+
+    first = pool.acquire()
+    pool.release(first)
+    second = pool.acquire()
+
+    assert second is first
+    assert len(created) == 1
+    assert pool.stats()['in_use'] == 1
+    pool.release(second)
+    assert pool.stats()['idle'] == 1
+
+
+def test_acquire_times_out_when_pool_is_exhausted():
+    connect, _ = counting_factory()
+    pool = ConnectionPool(connect, size=1, timeout=0.05)
+    pool.acquire()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    assert pool.stats()['timeouts'] == 1
+
+
+def test_waiting_checkout_gets_connection_released_by_another_thread():
+    connect, created = counting_factory()
+    pool = ConnectionPool(connect, size=1, timeout=5)
+    held = pool.acquire()
+    threading.Timer(0.05, pool.release, args=(held,)).start()
+
+    assert pool.acquire() is held
+    assert len(created) == 1
+    assert pool.stats()['waits'] == 1
+
+
+def test_stale_idle_connection_is_replaced():
+    connect, created = counting_factory()
+    pool = ConnectionPool(connect, size=1, ping_interval=0,
+                          health_check=lambda connection: connection.number > 0)
+    stale = pool.acquire()
+    pool.release(stale)
+
+    fresh = pool.acquire()
+    assert fresh is not stale
+    assert stale.closed
+    assert pool.stats()['discarded'] == 1
+
+
+def test_discarded_connection_frees_its_slot():
+    connect, created = counting_factory()
+    pool = ConnectionPool(connect, size=1, timeout=0.05)
+    pool.release(pool.acquire(), discard=True)
+
+    assert pool.acquire().number == 1
+    assert len(created) == 2
+
+
+def disconnect_error():
+    error = sqlite3.OperationalError("MySQL server has gone away")
+    error.errno = 2006
+    return error
+
+
+class FlakyConnection:
+    """Koneksi sqlite yang gagal sekali dengan error disconnect pada executemany"""
+    failures = 0
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+
+    def cursor(self):
+        cursor = self.connection.cursor()
+
+        class Cursor:
+            def executemany(self, query, rows):
+                if FlakyConnection.failures:
+                    FlakyConnection.failures -= 1
+                    raise disconnect_error()
+                return cursor.executemany(query, rows)
+
+            def __getattr__(self, name):
+                return getattr(cursor, name)
+        return Cursor()
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+
+def test_manager_retries_disconnect_on_fresh_connection(tmp_path):
+    path = str(tmp_path / 'db.sqlite')
+    sqlite3.connect(path).execute("CREATE TABLE t (x INTEGER)")
+    opened = []
+
+    def connect():
+        opened.append(FlakyConnection(path))
+        return opened[-1]
+
+    manager = DatabaseManager(connection_factory=connect, driver=sqlite3, pool_size=2)
+    FlakyConnection.failures = 1
+
+    assert manager.execute_many("INSERT INTO t (x) VALUES (?)", [(1,), (2,)]) == 2
+    assert len(opened) == 2
+    assert manager.pool.stats()['discarded'] == 1
+
+
+def test_manager_does_not_retry_bad_sql(tmp_path):
+    path = str(tmp_path / 'db.sqlite')
+    opened = []
+
+    def connect():
+        opened.append(sqlite3.connect(path, check_same_thread=False))
+        return opened[-1]
+
+    manager = DatabaseManager(connection_factory=connect, driver=sqlite3, pool_size=2)
+
+    with pytest.raises(sqlite3.OperationalError):
+        manager.execute_many("INSERT INTO missing (x) VALUES (?)", [(1,)])
+    assert len(opened) == 1
+    assert manager.pool.stats()['discarded'] == 0
+
+
+def test_paginated_helpers_use_driver_placeholder(tmp_path):
+    path = str(tmp_path / 'db.sqlite')
+    manager = DatabaseManager(
+        connection_factory=lambda: sqlite3.connect(path, check_same_thread=False),
+        driver=sqlite3, pool_size=1
+    )
+    manager.execute_query("CREATE TABLE comments (id INTEGER PRIMARY KEY, video_id TEXT, comment TEXT)")
+    manager.execute_many("INSERT INTO comments (video_id, comment) VALUES (?, ?)",
+                         [('v', f"komentar {i}") for i in range(5)] + [('w', "lain")])
+
+    page = manager.fetch_page('comments', ['comment'], after=1, page_size=2, equals={'video_id': 'v'})
+    assert page['id'].tolist() == [2, 3]
+    assert manager.count_rows('comments', equals={'video_id': 'v'}, contains={'comment': 'KOMENTAR 4'}) == 1
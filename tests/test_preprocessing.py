@@ -0,0 +1,64 @@
+import re
+
+import pytest
+from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+
+from core.preprocessing import TextPreprocessor
+from core.resources import get_slang_dict, get_stopwords
+
+COMMENTS = [
+    "Videonya bagus bgt, makasih kak!! https://youtu.be/abc123",
+    "@admin kalo bisa bahas lagi dong #edukasi",
+    "<b>Mantap</b> jiwa 👍👍 pertamaxx",
+    "aku gk ngerti sama sekali yg dijelasin di menit 3:15",
+    "Pemerintah harus memperbaiki kebijakan pendidikan",
+    "jelek bgt kualitas suaranya, sy kecewa",
+    "",
+    "   ",
+    "12345 !!!",
+    "Sangat bermanfaat dan menginspirasi, terima kasih banyak",
+    "Videonya bagus bgt, makasih kak!! https://youtu.be/abc123",
+]
+
+
+@pytest.fixture(scope='module')
+def preprocessor():
+    return TextPreprocessor(stem_cache_path=None)
+
+
+def baseline_clean_text(text, stemmer, slang_dict, stopword_set):
+    """clean_text versi awal repo: regex berurutan, slang per kata, stem seluruh teks"""
+    if not isinstance(text, str):
+        return ""
+    text = text.lower()
+    text = re.sub(r'http\S+', '', text)
+    text = re.sub(r'(@\w+|#\w+)', '', text)
+    text = re.sub('<.*?>', '', text)
+    text = re.sub(r'[^a-zA-Z\s]', '', text)
+    normalized_words = [slang_dict.get(word, word) for word in text.split()]
+    stemmed_text = stemmer.stem(' '.join(normalized_words))
+    return ' '.join(word for word in stemmed_text.split() if word not in stopword_set and len(word) > 1)
+
+
+@pytest.fixture(scope='module')
+def expected():
+    stemmer = StemmerFactory().create_stemmer()
+    slang_dict, stopword_set = get_slang_dict(), get_stopwords()
+    return [baseline_clean_text(text, stemmer, slang_dict, stopword_set) for text in COMMENTS]
+
+
+def test_clean_text_matches_baseline(preprocessor, expected):
+    assert [preprocessor.clean_text(text) for text in COMMENTS] == expected
+
+
+def test_batch_matches_baseline(preprocessor, expected):
+    assert preprocessor._clean_batch(COMMENTS) == expected
+
+
+@pytest.mark.parametrize('n_jobs, batch_size', [(1, 500), (2, 3)])
+def test_preprocess_texts_matches_baseline(preprocessor, expected, n_jobs, batch_size):
+    assert preprocessor.preprocess_texts(COMMENTS, n_jobs=n_jobs, batch_size=batch_size) == expected
+
+
+def test_non_string_is_empty(preprocessor):
+    assert preprocessor.preprocess_texts([None, float('nan')]) == ['', '']
@@ -0,0 +1,45 @@
+from core.slang import SlangTrie
+
+SLANG = {
+    'gak': 'tidak',
+    'gak papa': 'tidak apa-apa',
+    'gak papa kok': 'tidak apa-apa kok',
+    'mon maap': 'mohon maaf',
+    'bgt': 'banget',
+    'yg': 'yang',
+}
+
+
+def test_single_words_are_replaced_by_dict_lookup():
+    trie = SlangTrie.build(SLANG)
+
+    assert trie.normalize(['bagus', 'bgt', 'yg', 'ini']) == ['bagus', 'banget', 'yang', 'ini']
+
+
+def test_multi_word_entry_is_replaced_as_one_phrase():
+    trie = SlangTrie.build(SLANG)
+
+    assert trie.normalize(['mon', 'maap', 'telat']) == ['mohon maaf', 'telat']
+    assert trie.normalize(['videonya', 'gak', 'papa', 'bgt']) == ['videonya', 'tidak apa-apa', 'banget']
+
+
+def test_longest_matching_phrase_wins():
+    trie = SlangTrie.build(SLANG)
+
+    assert trie.normalize(['gak', 'papa', 'kok']) == ['tidak apa-apa kok']
+    # Awal frasa tanpa lanjutan yang cocok jatuh ke entri satu kata
+    assert trie.normalize(['gak', 'suka']) == ['tidak', 'suka']
+
+
+def test_partial_phrase_without_single_entry_is_kept():
+    trie = SlangTrie.build(SLANG)
+
+    assert trie.normalize(['mon', 'dong']) == ['mon', 'dong']
+    assert trie.normalize(['gak', 'papa', 'mon', 'maap']) == ['tidak apa-apa', 'mohon maaf']
+
+
+def test_keys_with_extra_whitespace_are_normalized():
+    trie = SlangTrie.build({'mon  maap ': 'mohon maaf'})
+
+    assert trie.normalize(['mon', 'maap']) == ['mohon maaf']
+    assert len(trie) == 1